@@ -9,7 +9,9 @@ from api.core.config import SYNC_SQLALCHEMY_DATABASE_URL
 from api.core.db import Base
 from api.models import candidates
 from api.models import applications
+from api.models import application_stats
 from api.models import users
+from api.models import jobs
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
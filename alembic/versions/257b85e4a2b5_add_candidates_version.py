@@ -0,0 +1,28 @@
+"""Add candidates version
+
+Revision ID: 257b85e4a2b5
+Revises: f2d64e8235c7
+Create Date: 2026-10-18 12:03:17.640251
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '257b85e4a2b5'
+down_revision: Union[str, Sequence[str], None] = 'f2d64e8235c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('candidates', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('candidates', 'version')
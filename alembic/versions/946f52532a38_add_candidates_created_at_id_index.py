@@ -0,0 +1,28 @@
+"""Add candidates created_at id index
+
+Revision ID: 946f52532a38
+Revises: 501e4d895d9b
+Create Date: 2026-10-18 09:12:41.218634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '946f52532a38'
+down_revision: Union[str, Sequence[str], None] = '501e4d895d9b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_candidates_created_at_id', 'candidates', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidates_created_at_id', table_name='candidates')
@@ -0,0 +1,48 @@
+"""Add updated_at and change_xid to candidates and applications
+
+Revision ID: 9a4f6c1e2d38
+Revises: 5d0b8e2c7a14
+Create Date: 2026-10-18 19:12:40.218455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f6c1e2d38'
+down_revision: Union[str, Sequence[str], None] = '5d0b8e2c7a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CURRENT_XACT_ID = 'pg_current_xact_id()::text::bigint'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('candidates', 'applications'):
+        op.add_column(
+            table, sa.Column('updated_at', sa.DateTime(), server_default=sa.text('localtimestamp'), nullable=False)
+        )
+        op.add_column(
+            table, sa.Column('change_xid', sa.BigInteger(), server_default=sa.text(CURRENT_XACT_ID), nullable=False)
+        )
+
+    # Existing rows were last written when they were created
+    op.execute('UPDATE candidates SET updated_at = created_at')
+    op.execute('UPDATE applications SET updated_at = applied_at')
+
+    for table in ('candidates', 'applications'):
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'], unique=False)
+        op.create_index(f'ix_{table}_change_xid_id', table, ['change_xid', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('candidates', 'applications'):
+        op.drop_index(f'ix_{table}_change_xid_id', table_name=table)
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+        op.drop_column(table, 'change_xid')
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,28 @@
+"""Add candidates skills gin index
+
+Revision ID: b79556231118
+Revises: 946f52532a38
+Create Date: 2026-10-18 09:47:05.903127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b79556231118'
+down_revision: Union[str, Sequence[str], None] = '946f52532a38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_candidates_skills', 'candidates', ['skills'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidates_skills', table_name='candidates', postgresql_using='gin')
@@ -0,0 +1,47 @@
+"""Add application stats table
+
+Revision ID: c41d7a9e3b52
+Revises: f9945e9edd06
+Create Date: 2026-10-18 15:02:11.418273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7a9e3b52'
+down_revision: Union[str, Sequence[str], None] = 'f9945e9edd06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'application_stats',
+        sa.Column('applied_on', sa.Date(), nullable=False),
+        sa.Column('job_title', sa.String(), nullable=False),
+        sa.Column(
+            'status', 
+            postgresql.ENUM(
+                'APPLIED', 'INTERVIEWING', 'REJECTED', 'HIRED', name='applicationstatus', create_type=False
+            ), 
+            nullable=False
+        ),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('applied_on', 'job_title', 'status')
+    )
+    op.execute(
+        'INSERT INTO application_stats (applied_on, job_title, status, count) '
+        'SELECT applied_at::date, job_title, status, count(*) FROM applications '
+        'GROUP BY applied_at::date, job_title, status'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('application_stats')
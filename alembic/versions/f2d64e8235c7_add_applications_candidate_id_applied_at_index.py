@@ -0,0 +1,33 @@
+"""Add applications candidate_id applied_at index
+
+Revision ID: f2d64e8235c7
+Revises: b79556231118
+Create Date: 2026-10-18 10:26:53.471092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d64e8235c7'
+down_revision: Union[str, Sequence[str], None] = 'b79556231118'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_applications_candidate_id_applied_at', 
+        'applications', 
+        ['candidate_id', sa.text('applied_at DESC')], 
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_candidate_id_applied_at', table_name='applications')
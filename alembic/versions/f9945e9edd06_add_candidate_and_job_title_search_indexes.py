@@ -0,0 +1,49 @@
+"""Add candidate and job title search indexes
+
+Revision ID: f9945e9edd06
+Revises: 257b85e4a2b5
+Create Date: 2026-10-18 13:21:48.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9945e9edd06'
+down_revision: Union[str, Sequence[str], None] = '257b85e4a2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_candidates_full_name_trgm', 'candidates', ['full_name'], unique=False, 
+        postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_candidates_email_trgm', 'candidates', ['email'], unique=False, 
+        postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+    )
+    op.add_column('applications', sa.Column(
+        'job_title_tsv', 
+        postgresql.TSVECTOR(), 
+        sa.Computed("to_tsvector('english', job_title)", persisted=True), 
+        nullable=True
+    ))
+    op.create_index(
+        'ix_applications_job_title_tsv', 'applications', ['job_title_tsv'], unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_job_title_tsv', table_name='applications', postgresql_using='gin')
+    op.drop_column('applications', 'job_title_tsv')
+    op.drop_index('ix_candidates_email_trgm', table_name='candidates', postgresql_using='gin')
+    op.drop_index('ix_candidates_full_name_trgm', table_name='candidates', postgresql_using='gin')
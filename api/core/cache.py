@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, Hashable
+from urllib.parse import urlsplit
+from api.core.config import cache_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire at an absolute epoch time."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, expires_at: float):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+class CacheError(Exception):
+    pass
+
+
+class CacheBackend:
+    """Byte-valued key store with atomic counters, the contract ResultCache relies on."""
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    async def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend, its counters are not shared between workers."""
+
+    def __init__(self, maxsize: int):
+        self.entries = LRUCache(maxsize)
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self.entries.set(key, value, time.time() + ttl)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Minimal client for the Redis wire protocol (RESP2), over a small pool of connections per process.
+
+    Each call takes an idle connection or opens one, up to pool_size at a time, and the timeout covers
+    waiting for a connection as well as the round trip.
+    """
+
+    def __init__(self, url: str, timeout: float, pool_size: int = 4):
+        parsed = urlsplit(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.database = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.execute('GET', key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.execute('SET', key, value, 'PX', int(ttl * 1000))
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self.execute('GET', key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self.execute('INCR', key)
+
+    async def execute(self, *args) -> Any:
+        try:
+            return await asyncio.wait_for(self._execute(args), self.timeout)
+        except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+            raise CacheError(f'Redis unavailable: {e!r}') from e
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+
+        for _, writer in idle:
+            await self._close_connection(writer)
+
+    async def _execute(self, args: tuple) -> Any:
+        async with self._slots:
+            reader, writer = self._idle.pop() if self._idle else await self._connect()
+            try:
+                reply = await self._roundtrip(reader, writer, args)
+            except BaseException:
+                # A connection interrupted mid-reply cannot be reused, the next reply read would be this one
+                await asyncio.shield(self._close_connection(writer))
+                raise
+
+            self._idle.append((reader, writer))
+            return reply
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            if self.password:
+                await self._roundtrip(reader, writer, ('AUTH', self.password))
+            if self.database:
+                await self._roundtrip(reader, writer, ('SELECT', self.database))
+        except BaseException:
+            await asyncio.shield(self._close_connection(writer))
+            raise
+
+        return reader, writer
+
+    async def _roundtrip(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, args: tuple) -> Any:
+        writer.write(encode_command(*args))
+        await writer.drain()
+
+        return await read_reply(reader)
+
+    @staticmethod
+    async def _close_connection(writer: asyncio.StreamWriter):
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+
+
+def encode_command(*args) -> bytes:
+    parts = [f'*{len(args)}\r\n'.encode()]
+
+    for arg in args:
+        value = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b'$%d\r\n%s\r\n' % (len(value), value))
+
+    return b''.join(parts)
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b'\r\n')
+    prefix, payload = line[:1], line[1:-2]
+
+    if prefix == b'+':
+        return payload.decode()
+    if prefix == b'-':
+        raise CacheError(payload.decode())
+    if prefix == b':':
+        return int(payload)
+    if prefix == b'$':
+        length = int(payload)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2]
+    if prefix == b'*':
+        length = int(payload)
+        return None if length < 0 else [await read_reply(reader) for _ in range(length)]
+
+    raise CacheError(f'Unexpected reply {line!r}')
+
+
+class ResultCache:
+    """Versioned result cache: bumping a namespace's counter orphans every entry written under the old value.
+
+    Callers read the version before running their query and store under that version, so a write that
+    lands in between leaves the fresh result unreachable instead of stale. Backend failures never fail
+    a request, they degrade to misses.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def version(self, namespace: str) -> int:
+        if self.backend is None:
+            return 0
+
+        try:
+            return await self.backend.get_counter(f'{namespace}:version')
+        except CacheError as e:
+            logger.warning('Result cache version lookup failed: %s', e)
+            return -1
+
+    async def get(self, namespace: str, version: int, key: str) -> bytes | None:
+        if self.backend is None or version < 0:
+            return None
+
+        try:
+            return await self.backend.get(f'{namespace}:{version}:{key}')
+        except CacheError as e:
+            logger.warning('Result cache read failed: %s', e)
+            return None
+
+    async def set(self, namespace: str, version: int, key: str, value: bytes):
+        if self.backend is None or version < 0:
+            return
+
+        try:
+            await self.backend.set(f'{namespace}:{version}:{key}', value, self.ttl)
+        except CacheError as e:
+            logger.warning('Result cache write failed: %s', e)
+
+    async def invalidate(self, namespace: str):
+        if self.backend is None:
+            return
+
+        try:
+            await self.backend.incr(f'{namespace}:version')
+        except CacheError as e:
+            logger.warning('Result cache invalidation failed, entries expire after the TTL: %s', e)
+
+
+def build_cache_backend() -> CacheBackend | None:
+    if cache_settings.backend == 'memory':
+        return MemoryCacheBackend(cache_settings.max_entries)
+    if cache_settings.backend == 'redis':
+        return RedisCacheBackend(
+            cache_settings.redis_url, cache_settings.redis_timeout, cache_settings.redis_pool_size
+        )
+
+    return None
+
+
+result_cache = ResultCache(build_cache_backend(), cache_settings.ttl)
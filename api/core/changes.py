@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.core.db import engine
+
+
+logger = logging.getLogger(__name__)
+
+CHANGES_CHANNEL = 'cmapi_changes'
+
+
+async def notify_changes(db: AsyncSession):
+    # Delivered when the surrounding transaction commits, and dropped if it rolls back
+    await db.execute(select(func.pg_notify(CHANGES_CHANNEL, '')))
+
+
+class ChangeListener:
+    """Shares one LISTEN connection between every change stream in this process.
+
+    Streams take the current event before they query and wait on it afterwards, so a commit landing
+    in between still wakes them. Without a connection streams keep working by polling.
+    """
+
+    def __init__(self, url: URL, channel: str, connect_timeout: float = 10.0):
+        self.dsn = url.set(drivername='postgresql').render_as_string(hide_password=False)
+        self.channel = channel
+        self.connect_timeout = connect_timeout
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._event = asyncio.Event()
+
+    def changed(self) -> asyncio.Event:
+        return self._event
+
+    def _wake(self, *args):
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    def _on_terminated(self, connection: asyncpg.Connection):
+        self._connection = None
+        self._wake()
+
+    async def start(self) -> bool:
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return True
+
+            try:
+                connection = await asyncpg.connect(self.dsn, timeout=self.connect_timeout)
+                await connection.add_listener(self.channel, self._wake)
+                connection.add_termination_listener(self._on_terminated)
+            except Exception as e:
+                logger.warning('Listening for changes failed, change streams fall back to polling: %s', e)
+                return False
+
+            self._connection = connection
+
+        return True
+
+    async def close(self):
+        async with self._lock:
+            if self._connection is not None:
+                connection, self._connection = self._connection, None
+                await connection.close()
+
+
+change_listener = ChangeListener(engine.url, CHANGES_CHANNEL)
@@ -0,0 +1,140 @@
+import zlib
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html')
+# Server-sent events must reach the client event by event, never held back by a compressor
+EXCLUDED_TYPES = ('text/event-stream',)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values and preferring br on ties."""
+    weights = {}
+
+    for part in accept_encoding.split(','):
+        name, *params = [item.strip() for item in part.split(';')]
+        weight = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.lower()] = weight
+
+    wildcard = weights.get('*', 0.0)
+    candidates = [
+        (weights.get(encoding, wildcard), priority, encoding) for priority, encoding in enumerate(('gzip', 'br'))
+    ]
+    weight, _, encoding = max(candidates)
+
+    return encoding if weight > 0 else None
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b'') -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b'') -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing text responses with negotiated brotli or gzip.
+
+    Single-shot bodies under minimum_size pass through untouched. Streamed bodies are compressed
+    chunk by chunk and flushed after each one, so exports reach the client incrementally.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 5, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compressor(self, encoding: str):
+        if encoding == 'br':
+            return _BrotliCompressor(self.brotli_quality)
+
+        return _GzipCompressor(self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message['type'] == 'http.response.start':
+                start_message = message
+                return
+
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message['headers'])
+                content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+                compressible = (
+                    content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith('+json')
+                ) and content_type not in EXCLUDED_TYPES
+
+                if compressible:
+                    headers.add_vary_header('Accept-Encoding')
+
+                if (
+                    not compressible or encoding is None or 'content-encoding' in headers
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = self.compressor(encoding)
+                headers['Content-Encoding'] = encoding
+                # Each encoding is a different byte stream, so a strong validator no longer holds for it
+                etag = headers.get('etag')
+                if etag and not etag.startswith('W/'):
+                    headers['ETag'] = f'W/{etag}'
+                if more_body:
+                    del headers['Content-Length']
+                else:
+                    body = compressor.finish(body)
+                    headers['Content-Length'] = str(len(body))
+                    await send(start_message)
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+
+                await send(start_message)
+
+            chunk = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+
+        await self.app(scope, receive, send_wrapper)
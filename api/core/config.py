@@ -1,4 +1,6 @@
 import os
+from typing import Literal
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Database config
 POSTGRESQL_USER = os.getenv('POSTGRES_USER')
@@ -10,10 +12,107 @@ POSTGRESQL_PORT = os.getenv('POSTGRES_PORT')
 SQLALCHEMY_DATABASE_URL = (os.getenv('DATABASE_URL'))
 SYNC_SQLALCHEMY_DATABASE_URL=(os.getenv('DATABASE_URL_SYNCH'))
 
+
+class DatabaseSettings(BaseSettings):
+    """Connection pool and driver tuning, read from DB_* environment variables."""
+    model_config = SettingsConfigDict(env_prefix='DB_', extra='ignore')
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0  # Seconds to wait for a connection before giving up
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1  # Seconds, -1 keeps connections forever
+    statement_cache_size: int = 100  # Prepared statements kept per asyncpg connection
+    warmup_connections: int | None = None  # Connections opened and prepared at startup, defaults to pool_size
+
+    replica_url: str | None = None  # Optional read replica for GET endpoints
+    replica_max_lag: float = 5.0  # Seconds of replay lag before reads fall back to the primary
+    replica_lag_check_interval: float = 1.0  # Seconds between replica lag checks
+    read_your_writes_window: float = 5.0  # Seconds a client reads from the primary after writing
+
+
+database_settings = DatabaseSettings()
+
+
+class CacheSettings(BaseSettings):
+    """Query result cache, read from CACHE_* environment variables."""
+    model_config = SettingsConfigDict(env_prefix='CACHE_', extra='ignore')
+
+    backend: Literal['none', 'memory', 'redis'] = 'none'
+    ttl: float = 30.0  # Seconds an entry may be served, bounds staleness from writes outside the API
+    max_entries: int = 1024  # Memory backend only
+    redis_url: str = 'redis://localhost:6379/0'
+    redis_timeout: float = 0.5  # Seconds before a Redis call, including waiting for a connection, counts as a miss
+    redis_pool_size: int = 4  # Redis connections per worker process
+
+
+cache_settings = CacheSettings()
+
+class ServerSettings(BaseSettings):
+    """Production server options for serve.py, read from SERVER_* environment variables."""
+    model_config = SettingsConfigDict(env_prefix='SERVER_', extra='ignore')
+
+    host: str = '0.0.0.0'
+    port: int = 8000
+    workers: int | None = None  # Defaults to the CPUs available to the container
+    keep_alive: int = 5  # Seconds an idle keep-alive connection stays open
+    backlog: int = 2048  # Pending connections the listening socket queues
+    graceful_timeout: int = 30  # Seconds in-flight requests get to finish on shutdown or restart
+    max_requests: int | None = None  # Recycle a worker after this many requests
+    access_log: bool = False
+    run_migrations: bool = True  # Disable where a separate release step migrates the database
+
+
+server_settings = ServerSettings()
+
+class CompressionSettings(BaseSettings):
+    """Negotiated response compression, read from COMPRESSION_* environment variables."""
+    model_config = SettingsConfigDict(env_prefix='COMPRESSION_', extra='ignore')
+
+    minimum_size: int = 1024  # Bytes, smaller single-shot responses are sent as is
+    gzip_level: int = 5  # 1 (fastest) to 9 (smallest)
+    brotli_quality: int = 4  # 0 (fastest) to 11 (smallest)
+
+
+compression_settings = CompressionSettings()
+
+class JobSettings(BaseSettings):
+    """Background job runner, read from JOBS_* environment variables."""
+    model_config = SettingsConfigDict(env_prefix='JOBS_', extra='ignore')
+
+    enabled: bool = True  # Disable to run API-only processes that never execute jobs
+    workers: int = 2  # Jobs run concurrently per process
+    poll_interval: float = 2.0  # Seconds between checks for jobs submitted by other processes
+    heartbeat_interval: float = 5.0  # Seconds between liveness updates and cancellation checks
+    stale_after: float = 60.0  # Seconds without a heartbeat before a running job is resumed elsewhere
+    max_attempts: int = 3  # Runs before a job that keeps crashing its worker is marked failed
+    max_input_size: int = 256 * 1024 * 1024  # Bytes a job's request body, such as an import file, may hold
+
+
+job_settings = JobSettings()
+
 # Pagination
 DEFAULT_PAGINATION_LIMIT: int = 10
+MAX_SEARCH_RESULTS: int = 100
+MAX_APPLICATIONS_PAGE_SIZE: int = 100
+
+# Change feed
+MAX_CHANGES_PAGE_SIZE: int = 1000
+CHANGES_POLL_INTERVAL: float = 5.0  # Seconds a change stream waits for a notification before querying anyway
+
+# Bulk import / export
+BULK_IMPORT_BATCH_SIZE: int = 5000
+EXPORT_BATCH_SIZE: int = 1000
+MAX_BULK_STATUS_UPDATE: int = 1000
+JOB_INPUT_CHUNK_SIZE: int = 1024 * 1024  # Bytes per stored chunk of a job's request body
 
 # JWT Auth
 SECRET_KEY = os.getenv('SECRET_KEY')
 ALGORITHM = os.getenv('ALGORITHM')
-ACCESS_TOKEN_EXPIRE = os.getenv('EXPIRATION')  # In minutes
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE = os.getenv('EXPIRATION')  # In minutes
+
+# Decoded access tokens kept in memory until they expire
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+
+# Password hashing, runs in a dedicated thread pool of this size
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 4))
\ No newline at end of file
@@ -1,20 +1,170 @@
+import math
+import time
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
-from api.core.config import SQLALCHEMY_DATABASE_URL
+from fastapi import Request, Response
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from api.core.config import SQLALCHEMY_DATABASE_URL, database_settings
+from api.core.metrics import instrument_engine
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+
+def build_engine(url: str) -> AsyncEngine:
+    database_engine = create_async_engine(
+        url,
+        poolclass=MonitoredQueuePool,
+        pool_size=database_settings.pool_size,
+        max_overflow=database_settings.max_overflow,
+        pool_timeout=database_settings.pool_timeout,
+        pool_pre_ping=database_settings.pool_pre_ping,
+        pool_recycle=database_settings.pool_recycle,
+        connect_args={'prepared_statement_cache_size': database_settings.statement_cache_size},
+    )
+    instrument_engine(database_engine)
+
+    return database_engine
+
+def get_pool_stats(database_engine: AsyncEngine) -> dict:
+    pool = database_engine.pool
+
+    return {
+        'size': pool.size(),
+        'checked_in': pool.checkedin(),
+        'checked_out': pool.checkedout(),
+        'overflow': pool.overflow(),
+        'checkouts': pool.checkouts,
+        'total_wait_seconds': pool.total_wait,
+        'max_wait_seconds': pool.max_wait,
+    }
+
+
+class ReplicaMonitor:
+    """Periodically measures replay lag on a read replica and reports whether it is fresh enough to read."""
+
+    LAG_QUERY = text(
+        'SELECT COALESCE(CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END, 0)'
+    )
+
+    def __init__(self, database_engine: AsyncEngine, max_lag: float, check_interval: float):
+        self.engine = database_engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: float | None = None
+        self.checked_at = float('-inf')
+
+    async def is_fresh(self) -> bool:
+        now = time.monotonic()
+
+        if now - self.checked_at >= self.check_interval:
+            self.checked_at = now
+            try:
+                async with self.engine.connect() as connection:
+                    self.lag = float(await connection.scalar(self.LAG_QUERY))
+            except (SQLAlchemyError, OSError):
+                self.lag = None
+
+        return self.lag is not None and self.lag <= self.max_lag
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+replica_engine = build_engine(database_settings.replica_url) if database_settings.replica_url else None
+ReplicaSessionLocal = (
+    async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine else None
+)
+replica_monitor = (
+    ReplicaMonitor(replica_engine, database_settings.replica_max_lag, database_settings.replica_lag_check_interval)
+    if replica_engine else None
+)
+
+READ_YOUR_WRITES_COOKIE = 'cmapi_read_primary_until'
+
+
+async def dispose_engines():
+    await engine.dispose()
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    database = SessionLocal()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+@event.listens_for(Session, 'after_commit')
+def _pin_reads_to_primary(session: Session):
+    # Clients that just wrote read from the primary for a while, so they never see their write missing
+    response = session.info.get('response')
+
+    if response is not None and replica_engine is not None:
+        window = database_settings.read_your_writes_window
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE, f'{time.time() + window:.3f}', max_age=math.ceil(window), httponly=True
+        )
+
+def _reads_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+async def _get_read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    if ReplicaSessionLocal is None or _reads_pinned_to_primary(request) or not await replica_monitor.is_fresh():
+        return SessionLocal
+
+    return ReplicaSessionLocal
+
+
+async def get_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
+    database = SessionLocal(info={'response': response})
     try:
         yield database
     finally:
         await database.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    session_factory = await _get_read_session_factory(request)
+    # Result caches consult these: pinned clients must see their own writes, and replica rows may lag
+    database = session_factory(info={
+        'pinned_to_primary': _reads_pinned_to_primary(request),
+        'replica': session_factory is ReplicaSessionLocal,
+    })
+    try:
+        yield database
+    finally:
+        await database.close()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    # For work that outlives the request handler, such as streaming responses
+    return SessionLocal
+
+
+async def get_read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    return await _get_read_session_factory(request)
@@ -0,0 +1,15 @@
+import hashlib
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b(':'.join(str(part) for part in parts).encode(), digest_size=16)
+
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+
+    return '*' in candidates or etag in (tag.removeprefix('W/') for tag in candidates)
@@ -0,0 +1,328 @@
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import suppress
+from datetime import timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from api.core.config import job_settings
+from api.core.db import SessionLocal
+from api.models.jobs import JobInputChunks, JobStatus, Jobs
+
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobLost(Exception):
+    """The job was claimed again by another runner, this one must stop working on it."""
+
+
+def _claimed(job_id: uuid.UUID, attempt: int) -> tuple:
+    # Fencing token: a new claim bumps attempts, so updates from a runner that lost the job match nothing
+    return Jobs.id == job_id, Jobs.status == JobStatus.RUNNING, Jobs.attempts == attempt
+
+
+class JobContext:
+    """What a job handler sees of its job: parameters, the last checkpoint and a way to report progress."""
+
+    def __init__(self, job: Jobs, session_factory: async_sessionmaker[AsyncSession]):
+        self.id = job.id
+        self.attempt = job.attempts
+        self.params = job.params
+        self.checkpoint = job.checkpoint
+        self.session_factory = session_factory
+        self.cancel_requested = False
+        self.lost = False
+
+    async def iter_input(self) -> AsyncIterator[bytes]:
+        """Yield the stored request body chunk by chunk, so it is never loaded whole."""
+        seq = 0
+
+        while True:
+            async with self.session_factory() as db:
+                data = await db.scalar(
+                    select(JobInputChunks.data).where(JobInputChunks.job_id == self.id, JobInputChunks.seq == seq)
+                )
+            if data is None:
+                return
+
+            yield data
+            seq += 1
+
+    async def report(self, progress: int, total: int | None = None, checkpoint: dict | None = None):
+        """Persist progress and an optional resume point.
+
+        Raises JobCancelled if a cancel was requested, and JobLost if another runner has claimed the job.
+        """
+        values = {'progress': progress, 'heartbeat_at': func.now()}
+        if total is not None:
+            values['total'] = total
+        if checkpoint is not None:
+            values['checkpoint'] = checkpoint
+            self.checkpoint = checkpoint
+
+        async with self.session_factory() as db:
+            claimed = (await db.execute(
+                update(Jobs).where(*_claimed(self.id, self.attempt)).values(**values).returning(Jobs.cancel_requested)
+            )).first()
+            await db.commit()
+
+        if claimed is None:
+            self.lost = True
+            raise JobLost()
+        if claimed.cancel_requested:
+            self.cancel_requested = True
+            raise JobCancelled()
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict | None]]
+
+job_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str):
+    """Register the coroutine that runs jobs of this kind."""
+    def register(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = handler
+        return handler
+
+    return register
+
+
+class JobRunner:
+    """Runs queued jobs on a fixed number of worker tasks in this process.
+
+    The jobs table is the queue: workers claim rows with SKIP LOCKED, so any number of processes can
+    share it. Running jobs send heartbeats, and a job whose heartbeat goes stale, because its process
+    died, is claimed again and resumed from its last checkpoint. Jobs still running at a clean shutdown
+    are put back in the queue straight away. Every update a runner makes to a job is fenced by the attempt
+    it claimed, and a runner whose heartbeats fail for stale_after stops the job itself, so a job taken
+    over by another runner is never written to by both.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        heartbeat_interval: float = 5.0,
+        stale_after: float = 60.0,
+        max_attempts: int = 3
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._running: dict[uuid.UUID, tuple[asyncio.Task, JobContext]] = {}
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    def notify(self):
+        # Submissions from this process start without waiting for the next poll
+        self._wakeup.set()
+
+    def cancel_local(self, job_id: uuid.UUID) -> bool:
+        running = self._running.get(job_id)
+        if running is None:
+            return False
+
+        task, context = running
+        context.cancel_requested = True
+        task.cancel()
+
+        return True
+
+    async def claim(self) -> Jobs | None:
+        stale_before = func.now() - timedelta(seconds=self.stale_after)
+        claimable = (
+            select(Jobs.id)
+            .where(or_(
+                Jobs.status == JobStatus.QUEUED,
+                and_(Jobs.status == JobStatus.RUNNING, Jobs.heartbeat_at < stale_before)
+            ))
+            .order_by(Jobs.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+
+        async with self.session_factory() as db:
+            job = await db.scalar(
+                update(Jobs)
+                .where(Jobs.id == claimable)
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=Jobs.attempts + 1,
+                    started_at=func.coalesce(Jobs.started_at, func.now()),
+                    heartbeat_at=func.now()
+                )
+                .returning(Jobs)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        return job
+
+    async def run_pending(self) -> int:
+        """Run claimable jobs one after another until none are left, returning how many ran."""
+        count = 0
+
+        while (job := await self.claim()) is not None:
+            await self.run(job)
+            count += 1
+
+        return count
+
+    async def run(self, job: Jobs):
+        if job.cancel_requested:
+            await self._finish(job.id, job.attempts, JobStatus.CANCELLED)
+            return
+        if job.attempts > self.max_attempts:
+            await self._finish(
+                job.id, job.attempts, JobStatus.FAILED, error=f'Gave up after {self.max_attempts} attempts.'
+            )
+            return
+
+        handler = job_handlers.get(job.kind)
+        if handler is None:
+            await self._finish(job.id, job.attempts, JobStatus.FAILED, error=f'Unknown job kind: {job.kind}.')
+            return
+
+        context = JobContext(job, self.session_factory)
+        task = asyncio.create_task(handler(context))
+        heartbeat = asyncio.create_task(self._heartbeat(context, task))
+        self._running[job.id] = (task, context)
+
+        try:
+            result = await task
+        except JobCancelled:
+            await self._finish(job.id, job.attempts, JobStatus.CANCELLED)
+        except JobLost:
+            logger.warning('Job %s (%s) was claimed by another runner, stopped here', job.id, job.kind)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # The runner is shutting down, hand the job back to the queue
+                await asyncio.shield(self._release(job.id, job.attempts))
+                raise
+            if context.lost:
+                logger.warning('Job %s (%s) was claimed by another runner, stopped here', job.id, job.kind)
+            else:
+                await self._finish(job.id, job.attempts, JobStatus.CANCELLED)
+        except Exception as e:
+            logger.exception('Job %s (%s) failed', job.id, job.kind)
+            await self._finish(job.id, job.attempts, JobStatus.FAILED, error=str(e) or type(e).__name__)
+        else:
+            await self._finish(job.id, job.attempts, JobStatus.SUCCEEDED, result=result)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.id, None)
+
+    async def _heartbeat(self, context: JobContext, task: asyncio.Task):
+        last_beat = time.monotonic()
+
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as db:
+                    claimed = (await db.execute(
+                        update(Jobs)
+                        .where(*_claimed(context.id, context.attempt))
+                        .values(heartbeat_at=func.now())
+                        .returning(Jobs.cancel_requested)
+                    )).first()
+                    await db.commit()
+            except Exception as e:
+                logger.warning('Heartbeat for job %s failed: %s', context.id, e)
+                if time.monotonic() - last_beat < self.stale_after:
+                    continue
+                # The job looks stale to other runners by now and may already run elsewhere
+                claimed = None
+
+            if claimed is None:
+                context.lost = True
+                task.cancel()
+                return
+            if claimed.cancel_requested:
+                context.cancel_requested = True
+                task.cancel()
+                return
+
+            last_beat = time.monotonic()
+
+    async def _finish(
+        self, job_id: uuid.UUID, attempt: int, status: JobStatus, result: Any = None, error: str | None = None
+    ):
+        async with self.session_factory() as db:
+            finished = await db.execute(
+                update(Jobs)
+                .where(*_claimed(job_id, attempt))
+                .values(status=status, result=result, error=error, finished_at=func.now(), heartbeat_at=None)
+            )
+            if finished.rowcount:
+                # A finished job is never resumed, its input would only take up space
+                await db.execute(delete(JobInputChunks).where(JobInputChunks.job_id == job_id))
+            await db.commit()
+
+        if finished.rowcount == 0:
+            logger.warning('Job %s was claimed by another runner, its %s outcome is discarded', job_id, status.value)
+
+    async def _release(self, job_id: uuid.UUID, attempt: int):
+        async with self.session_factory() as db:
+            await db.execute(
+                update(Jobs)
+                .where(*_claimed(job_id, attempt))
+                .values(status=JobStatus.QUEUED, heartbeat_at=None, attempts=Jobs.attempts - 1)
+            )
+            await db.commit()
+
+    async def _work(self):
+        while True:
+            try:
+                job = await self.claim()
+            except Exception as e:
+                logger.warning('Claiming a job failed, retrying in %.0f seconds: %s', self.poll_interval, e)
+                job = None
+
+            if job is not None:
+                try:
+                    await self.run(job)
+                except Exception as e:
+                    # The job keeps its stale heartbeat and is picked up again once stale_after has passed
+                    logger.warning('Recording the outcome of job %s failed: %s', job.id, e)
+                continue
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            self._wakeup.clear()
+
+
+job_runner = JobRunner(
+    SessionLocal,
+    workers=job_settings.workers,
+    poll_interval=job_settings.poll_interval,
+    heartbeat_interval=job_settings.heartbeat_interval,
+    stale_after=job_settings.stale_after,
+    max_attempts=job_settings.max_attempts
+)
@@ -0,0 +1,200 @@
+import bisect
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.description}'
+        yield f'# TYPE {self.name} {self.kind}'
+        for label_values, value in sorted(self._values.items()):
+            yield f'{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}'
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float):
+        self._values[label_values] = value
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, *label_values: str, value: float):
+        counts, totals = self._series.setdefault(label_values, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+
+    def summary(self, *label_values: str) -> tuple[int, float]:
+        counts, totals = self._series.get(label_values, ([0], [0.0]))
+
+        return sum(counts), totals[0]
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.description}'
+        yield f'# TYPE {self.name} {self.kind}'
+        for label_values, (counts, totals) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f'{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labels, label_values)} {_format_value(totals[0])}'
+            yield f'{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        # Collectors refresh gauges that are sampled at scrape time, such as pool statistics
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+
+        return '\n'.join(line for metric in self._metrics for line in metric.render()) + '\n'
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    'http_requests_total', 'HTTP requests by route and status code.', ('method', 'route', 'status')
+))
+http_request_duration_seconds = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency in seconds.', ('method', 'route')
+))
+http_requests_in_progress = registry.register(Gauge(
+    'http_requests_in_progress', 'HTTP requests currently being served.', ('method',)
+))
+db_queries_per_request = registry.register(Histogram(
+    'db_queries_per_request', 'Database statements executed per HTTP request.', ('method', 'route'),
+    buckets=QUERY_COUNT_BUCKETS
+))
+db_time_per_request_seconds = registry.register(Histogram(
+    'db_time_per_request_seconds', 'Time spent in database statements per HTTP request.', ('method', 'route')
+))
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    seconds: float = 0.0
+
+
+request_db_stats: ContextVar[RequestDbStats | None] = ContextVar('request_db_stats', default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own execution context, so a statement that raises leaves nothing behind
+    context._query_started_at = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, '_query_started_at', None)
+    stats = request_db_stats.get()
+
+    if stats is not None and started_at is not None:
+        stats.queries += 1
+        stats.seconds += time.perf_counter() - started_at
+
+def instrument_engine(database_engine: AsyncEngine):
+    event.listen(database_engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(database_engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status codes, in-flight requests and database cost per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status_code = 500
+        stats = RequestDbStats()
+        token = request_db_stats.set(stats)
+        started_at = time.perf_counter()
+        http_requests_in_progress.inc(method)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            route = scope.get('route')
+            route_path = getattr(route, 'path', 'unmatched')
+
+            http_requests_in_progress.dec(method)
+            http_requests_total.inc(method, route_path, str(status_code))
+            http_request_duration_seconds.observe(method, route_path, value=elapsed)
+            db_queries_per_request.observe(method, route_path, value=stats.queries)
+            db_time_per_request_seconds.observe(method, route_path, value=stats.seconds)
+            request_db_stats.reset(token)
@@ -0,0 +1,20 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    payload = json.dumps([sort_value.isoformat(), str(row_id)], separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        return datetime.fromisoformat(sort_value), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor.')
@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class DataFormat(str, Enum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+CONTENT_TYPES = {
+    DataFormat.NDJSON: 'application/x-ndjson',
+    DataFormat.CSV: 'text/csv',
+}
+
+FORMATS_BY_CONTENT_TYPE = {
+    'application/x-ndjson': DataFormat.NDJSON,
+    'application/jsonl': DataFormat.NDJSON,
+    'application/json-lines': DataFormat.NDJSON,
+    'text/csv': DataFormat.CSV,
+}
+
+
+def format_from_content_type(content_type: str | None) -> DataFormat | None:
+    media_type = (content_type or '').split(';')[0].strip().lower()
+
+    return FORMATS_BY_CONTENT_TYPE.get(media_type)
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b''
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line
+
+    if buffer:
+        yield buffer
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], data_format: DataFormat
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """Yield (row number, record, error) for every non-blank row of an NDJSON or CSV body.
+
+    Rows that cannot be decoded are reported through the error slot instead of raising, so a
+    single bad line never aborts the rest of the stream. CSV rows may span several lines when a
+    quoted field contains a newline.
+    """
+    header = None
+    pending = ''
+    row_number = 0
+
+    async for raw_line in iter_lines(chunks):
+        try:
+            line = raw_line.decode('utf-8-sig' if row_number == 0 else 'utf-8').rstrip('\r')
+        except UnicodeDecodeError:
+            row_number += 1
+            yield row_number, None, 'Row is not valid UTF-8.'
+            continue
+
+        if data_format == DataFormat.CSV:
+            pending = f'{pending}\n{line}' if pending else line
+            if pending.count('"') % 2:
+                continue
+            line, pending = pending, ''
+
+        if not line.strip():
+            continue
+
+        if data_format == DataFormat.NDJSON:
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield row_number, None, f'Invalid JSON: {e}'
+                continue
+            if not isinstance(record, dict):
+                yield row_number, None, 'Row must be a JSON object.'
+                continue
+            yield row_number, record, None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip().lower() for value in values]
+            continue
+
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, None, f'Expected {len(header)} columns, got {len(values)}.'
+            continue
+        yield row_number, dict(zip(header, values)), None
+
+    if pending:
+        row_number += 1
+        yield row_number, None, 'Unterminated quoted field.'
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ';'.join(str(item) for item in value)
+
+    return value
+
+async def export_rows(
+    session_factory: async_sessionmaker[AsyncSession],
+    query: Select,
+    schema: type[BaseModel],
+    data_format: DataFormat,
+    batch_size: int,
+) -> AsyncIterator[str]:
+    """Stream the rows of query serialized through schema, one server-side cursor batch at a time."""
+    fields = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    if data_format == DataFormat.CSV:
+        writer.writerow(fields)
+
+    async with session_factory() as session:
+        result = await session.stream_scalars(query.execution_options(yield_per=batch_size))
+
+        async for rows in result.partitions():
+            for row in rows:
+                item = schema.model_validate(row)
+                if data_format == DataFormat.NDJSON:
+                    buffer.write(item.model_dump_json())
+                    buffer.write('\n')
+                else:
+                    record = item.model_dump(mode='json')
+                    writer.writerow([_csv_value(record[field]) for field in fields])
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
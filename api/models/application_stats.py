@@ -0,0 +1,16 @@
+from datetime import date
+from sqlalchemy import Date, Enum as SQLEnum, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from api.core.db import Base
+from api.models.applications import ApplicationStatus
+
+
+class ApplicationStats(Base):
+    """Application counts per day, job title and status, kept in step with every status change."""
+
+    __tablename__ = 'application_stats'
+
+    applied_on: Mapped[date] = mapped_column(Date, primary_key=True)
+    job_title: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[ApplicationStatus] = mapped_column(SQLEnum(ApplicationStatus), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
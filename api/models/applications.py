@@ -1,11 +1,15 @@
 import uuid
 from enum import Enum
 from datetime import datetime
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, String
+from typing import TYPE_CHECKING
+from sqlalchemy import Computed, DateTime, Enum as SQLEnum, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from api.core.db import Base
-from api.models.base import BaseModel
+from api.models.base import BaseModel, TrackedChangesMixin
+
+if TYPE_CHECKING:
+    from api.models.candidates import Candidates
 
 
 class ApplicationStatus(str, Enum):
@@ -15,7 +19,7 @@ class ApplicationStatus(str, Enum):
     HIRED = 'hired'
 
 
-class Applications(BaseModel, Base):
+class Applications(TrackedChangesMixin, BaseModel, Base):
     __tablename__ = 'applications'
 
     candidate_id: Mapped[uuid.UUID] = mapped_column(
@@ -24,3 +28,17 @@ class Applications(BaseModel, Base):
     job_title: Mapped[str] = mapped_column(String, nullable=False)
     status: Mapped[ApplicationStatus] = mapped_column(SQLEnum(ApplicationStatus), nullable=False)
     applied_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    job_title_tsv: Mapped[str] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', job_title)", persisted=True), deferred=True
+    )
+    candidate: Mapped['Candidates'] = relationship(back_populates='applications', lazy='raise')
+
+
+Index(
+    'ix_applications_candidate_id_applied_at', 
+    Applications.candidate_id, 
+    Applications.applied_at.desc()
+)
+Index('ix_applications_job_title_tsv', Applications.job_title_tsv, postgresql_using='gin')
+Index('ix_applications_updated_at', Applications.updated_at)
+Index('ix_applications_change_xid_id', Applications.change_xid, Applications.id)
@@ -1,5 +1,7 @@
 import uuid
+from datetime import datetime
 from api.core.db import Base
+from sqlalchemy import BigInteger, DateTime, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -9,4 +11,30 @@ class BaseModel(Base):
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4
-    )
\ No newline at end of file
+    )
+
+
+# 64-bit id of the writing transaction, unlike xmin it never wraps around
+CURRENT_XACT_ID = 'pg_current_xact_id()::text::bigint'
+
+
+class TrackedChangesMixin:
+    """Stamps every insert and update issued through SQLAlchemy, raw SQL updates must set both columns.
+
+    change_xid orders the change feed: once it is below the oldest running transaction, no row can
+    still appear behind it.
+    """
+
+    # The server-generated change_xid is only read by the change feed, never fetched back after an insert
+    __mapper_args__ = {'eager_defaults': False}
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, onupdate=func.localtimestamp(), server_default=func.localtimestamp()
+    )
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, 
+        nullable=False, 
+        onupdate=text(CURRENT_XACT_ID), 
+        server_default=text(CURRENT_XACT_ID), 
+        deferred=True
+    )
@@ -1,17 +1,44 @@
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import ARRAY, DateTime, String
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import ARRAY, DDL, DateTime, Index, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from api.core.db import Base
-from api.models.base import BaseModel
+from api.models.base import BaseModel, TrackedChangesMixin
 
+if TYPE_CHECKING:
+    from api.models.applications import Applications
 
-class Candidates(BaseModel, Base):
+
+class Candidates(TrackedChangesMixin, BaseModel, Base):
     __tablename__ = 'candidates'
+    __table_args__ = (
+        Index('ix_candidates_created_at_id', 'created_at', 'id'),
+        Index('ix_candidates_skills', 'skills', postgresql_using='gin'),
+        Index('ix_candidates_updated_at', 'updated_at'),
+        Index('ix_candidates_change_xid_id', 'change_xid', 'id'),
+        Index(
+            'ix_candidates_full_name_trgm', 'full_name', 
+            postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}
+        ),
+        Index(
+            'ix_candidates_email_trgm', 'email', 
+            postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+        ),
+    )
 
     full_name: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str] = mapped_column(String, nullable=False, unique=True)
     phone: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     skills: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
-    
\ No newline at end of file
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default='1')
+
+    # Never loaded implicitly, callers opt in with selectinload so listing candidates stays one query per page
+    applications: Mapped[List['Applications']] = relationship(
+        back_populates='candidate',
+        order_by='(Applications.applied_at.desc(), Applications.id.desc())',
+        lazy='raise'
+    )
+
+
+event.listen(Base.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
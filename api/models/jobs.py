@@ -0,0 +1,58 @@
+import uuid
+from enum import Enum
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from api.core.db import Base
+from api.models.base import BaseModel
+
+
+class JobStatus(str, Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+class Jobs(BaseModel, Base):
+    """Background work submitted by the API and run by the job runner, one row per job."""
+
+    __tablename__ = 'jobs'
+
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[JobStatus] = mapped_column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Handler-defined resume point, work done after it may run again when the job is resumed
+    checkpoint: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    result: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default='false')
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class JobInputChunks(Base):
+    """Request body of a job, such as an import file, kept in order until the job finishes so it can be resumed."""
+
+    __tablename__ = 'job_input_chunks'
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+# Workers claim the oldest unfinished job, so only those rows are indexed
+Index(
+    'ix_jobs_status_created_at', Jobs.status, Jobs.created_at,
+    postgresql_where=Jobs.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+)
@@ -1,10 +1,18 @@
-from fastapi import APIRouter
+from datetime import date
+from fastapi import APIRouter, Query
 from fastapi.params import Depends
-from api.core.db import get_db
-from api.schemas.applications import ApplicationSchema, ApplicationUpdateStatusSchema
-from api.services.applications import update_application
+from fastapi.responses import StreamingResponse
+from api.core.db import get_db, get_read_db, get_session_factory
+from api.core.streams import CONTENT_TYPES, DataFormat
+from api.schemas.applications import (
+    ApplicationBulkUpdateSchema, ApplicationBulkUpdateStatusSchema, ApplicationSchema, ApplicationStatsSchema, 
+    ApplicationUpdateStatusSchema
+)
+from api.services.applications import (
+    export_applications, get_application_stats, update_application, update_applications_status
+)
 from api.services.users import verify_access_token
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
 router = APIRouter(
@@ -14,6 +22,34 @@ router = APIRouter(
 )
 
 
+@router.get('/export', response_class=StreamingResponse)
+async def get_applications_export(
+    format: DataFormat = DataFormat.NDJSON, 
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory)
+):
+    return StreamingResponse(
+        export_applications(session_factory, format),
+        media_type=CONTENT_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="applications.{format.value}"'}
+    )
+
+@router.get('/stats', response_model=list[ApplicationStatsSchema])
+async def get_applications_stats(
+    applied_from: date | None = Query(default=None, description='First day of the window, inclusive'),
+    applied_to: date | None = Query(default=None, description='Last day of the window, inclusive'),
+    job_title: str | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    stats = await get_application_stats(db, applied_from, applied_to, job_title)
+
+    return stats
+
+@router.patch('', response_model=ApplicationBulkUpdateSchema)
+async def patch_applications(bulk_update: ApplicationBulkUpdateStatusSchema, db: AsyncSession = Depends(get_db)):
+    result = await update_applications_status(db, bulk_update)
+
+    return result
+
 @router.patch('/{application_id}', response_model=ApplicationSchema)
 async def patch_application(
     application_id: str, status: ApplicationUpdateStatusSchema, db: AsyncSession = Depends(get_db)
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from fastapi.params import Depends
-from api.core.config import DEFAULT_PAGINATION_LIMIT
-from api.core.db import get_db
+from api.core.config import DEFAULT_PAGINATION_LIMIT, MAX_APPLICATIONS_PAGE_SIZE, MAX_SEARCH_RESULTS
+from fastapi.responses import StreamingResponse
+from api.core.db import get_db, get_read_db, get_read_session_factory
+from api.core.etag import etag_matches, make_etag
+from api.core.serialization import RowSerializer, json_response
+from api.core.streams import CONTENT_TYPES, DataFormat, format_from_content_type
+from api.models.applications import ApplicationStatus
 from api.schemas.applications import ApplicationCreateSchema, ApplicationSchema
-from api.schemas.candidates import CandidateDetailedSchema, CandidateSchema, CandidateUpdateSchema
+from api.services.applications import get_applications_list_by_candidate_id, get_applications_next_cursor
+from api.schemas.candidates import (
+    CandidateDetailedSchema, CandidateImportSchema, CandidateInclude, CandidateSchema, 
+    CandidateSearchResultSchema, CandidateUpdateSchema, CandidateWithApplicationsSchema, CountMode, SkillsMatch
+)
 from api.services.candidates import (
-    create_candidate, create_candidate_application, get_applications_by_candidate_id, 
-    get_candidates_list, get_candidate_by_id, update_candidate
+    count_candidates, create_candidate, create_candidate_application, export_candidates, get_candidates_list, 
+    get_candidates_next_cursor, get_candidates_page, get_candidate_by_id, get_candidate_version, import_candidates, 
+    search_candidates, update_candidate
 )
 from api.services.users import verify_access_token
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
 router = APIRouter(
@@ -18,23 +28,97 @@ router = APIRouter(
     tags=['Candidates']
 )
 
+candidate_with_applications_serializer = RowSerializer(CandidateWithApplicationsSchema)
+application_serializer = RowSerializer(ApplicationSchema)
+
 
-@router.get('/', response_model=list[CandidateSchema])
+@router.get('/', response_model=None, responses={
+    200: {
+        'model': list[CandidateWithApplicationsSchema] | list[CandidateSchema],
+        'description': 'Candidates, with their applications embedded when include=applications'
+    }
+})
 async def get_candidates(
+    response: Response,
     offset: int = 0, 
     limit: int = DEFAULT_PAGINATION_LIMIT, 
     skills: list[str] = Query(default=[]),
-    db: AsyncSession = Depends(get_db)
+    cursor: str | None = Query(default=None, description='Opaque cursor from X-Next-Cursor, replaces offset'),
+    match: SkillsMatch = Query(default=SkillsMatch.ANY, description='Match any or all of the given skills'),
+    count: CountMode = Query(default=CountMode.NONE, description='Return the total in X-Total-Count'),
+    include: list[CandidateInclude] = Query(default=[], description='Related collections to embed'),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    candidates = await get_candidates_list(db, offset, limit, skills)
+    # Plain pages go through the result cache, embedded applications are not invalidated by it
+    if CandidateInclude.APPLICATIONS in include:
+        candidates = await get_candidates_list(db, offset, limit, skills, cursor, match, True)
+        body = candidate_with_applications_serializer.dump_json(candidates)
+        next_cursor = get_candidates_next_cursor(candidates, limit)
+    else:
+        body, next_cursor = await get_candidates_page(db, offset, limit, skills, cursor, match)
+
+    total = await count_candidates(db, skills, match, count)
+    if total is not None:
+        response.headers['X-Total-Count'] = str(total)
+
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
     
-    return candidates
+    return json_response(body, response)
+
+@router.get('/search', response_model=list[CandidateSearchResultSchema])
+async def get_candidates_search(
+    q: str = Query(min_length=1, description='Partial name, email or job title'),
+    limit: int = Query(default=DEFAULT_PAGINATION_LIMIT, ge=1, le=MAX_SEARCH_RESULTS),
+    db: AsyncSession = Depends(get_read_db)
+):
+    results = await search_candidates(db, q, limit)
+
+    return [
+        CandidateSearchResultSchema(**CandidateSchema.model_validate(candidate).model_dump(), score=score)
+        for candidate, score in results
+    ]
+
+@router.get('/export', response_class=StreamingResponse)
+async def get_candidates_export(
+    format: DataFormat = DataFormat.NDJSON, 
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory)
+):
+    return StreamingResponse(
+        export_candidates(session_factory, format),
+        media_type=CONTENT_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="candidates.{format.value}"'}
+    )
+
+@router.get('/{candidate_id}', response_model=None, responses={
+    200: {
+        'model': CandidateWithApplicationsSchema | CandidateSchema,
+        'description': 'The candidate, with their applications embedded when include=applications'
+    }
+})
+async def get_candidate(
+    candidate_id: str, 
+    request: Request, 
+    response: Response, 
+    include: list[CandidateInclude] = Query(default=[], description='Related collections to embed'),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Embedded applications change the representation, so they are part of the ETag
+    if_none_match = request.headers.get('if-none-match')
+    include_applications = CandidateInclude.APPLICATIONS in include
+    representation = (CandidateInclude.APPLICATIONS.value,) if include_applications else ()
+
+    if if_none_match:
+        etag = make_etag(request.url.path, *representation, await get_candidate_version(db, candidate_id))
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
 
-@router.get('/{candidate_id}', response_model=CandidateSchema)
-async def get_candidate(candidate_id: str, db: AsyncSession = Depends(get_db)):
-    candidate = await get_candidate_by_id(db, candidate_id)
+    candidate = await get_candidate_by_id(db, candidate_id, include_applications)
+    response.headers['ETag'] = make_etag(request.url.path, *representation, candidate.version)
+    # The shape follows include, never which schema happens to validate against the loaded row
+    schema = CandidateWithApplicationsSchema if include_applications else CandidateSchema
     
-    return candidate
+    return json_response(schema.model_validate(candidate).model_dump_json().encode(), response)
 
 @router.post('/', response_model=CandidateSchema)
 async def post_candidate(candidate: CandidateDetailedSchema, db: AsyncSession = Depends(get_db)):
@@ -42,6 +126,20 @@ async def post_candidate(candidate: CandidateDetailedSchema, db: AsyncSession =
 
     return new_candidate
 
+@router.post('/bulk', response_model=CandidateImportSchema)
+async def post_candidates_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+    data_format = format_from_content_type(request.headers.get('content-type'))
+
+    if data_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail='Body must be NDJSON (application/x-ndjson) or CSV (text/csv).'
+        )
+
+    result = await import_candidates(db, request.stream(), data_format)
+
+    return result
+
 @router.put('/{candidate_id}', response_model=CandidateUpdateSchema)
 async def put_candidate(
     candidate_id: str, candidate: CandidateUpdateSchema, db: AsyncSession = Depends(get_db)
@@ -51,10 +149,31 @@ async def put_candidate(
     return updated_candidate
 
 @router.get('/{candidate_id}/applications', response_model=list[ApplicationSchema])
-async def get_candidate_applications(candidate_id: str, db: AsyncSession = Depends(get_db)):
-    applications = await get_applications_by_candidate_id(db, candidate_id)
+async def get_candidate_applications(
+    candidate_id: str, 
+    request: Request,
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGINATION_LIMIT, ge=1, le=MAX_APPLICATIONS_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description='Opaque cursor from X-Next-Cursor'),
+    application_status: ApplicationStatus | None = Query(default=None, alias='status'),
+    db: AsyncSession = Depends(get_read_db)
+):
+    version = await get_candidate_version(db, candidate_id)
+    etag = make_etag(request.url.path, request.url.query, version)
+
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    applications = await get_applications_list_by_candidate_id(
+        db, candidate_id, limit, cursor, application_status
+    )
+
+    response.headers['ETag'] = etag
+    next_cursor = get_applications_next_cursor(applications, limit)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
 
-    return applications
+    return application_serializer.response(applications, response)
 
 @router.post('/{candidate_id}/applications', response_model=ApplicationSchema)
 async def post_candidate_application(
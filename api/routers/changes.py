@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Header, Query
+from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
+from api.core.config import DEFAULT_PAGINATION_LIMIT, MAX_CHANGES_PAGE_SIZE
+from api.core.db import get_read_db, get_read_session_factory
+from api.schemas.changes import ChangesPageSchema
+from api.services.changes import get_changes, stream_changes
+from api.services.users import verify_access_token
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+router = APIRouter(
+    prefix='/changes',
+    dependencies=[Depends(verify_access_token)],
+    tags=['Changes']
+)
+
+
+@router.get('', response_model=ChangesPageSchema)
+async def get_changes_page(
+    since: str | None = Query(default=None, description='Cursor from a previous page, omit to start at the beginning'),
+    limit: int = Query(default=DEFAULT_PAGINATION_LIMIT, ge=1, le=MAX_CHANGES_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    page = await get_changes(db, since, limit)
+
+    return page
+
+@router.get('/stream', response_class=StreamingResponse)
+async def get_changes_stream(
+    since: str | None = Query(default=None, description='Cursor to start after, Last-Event-ID takes precedence'),
+    limit: int = Query(default=MAX_CHANGES_PAGE_SIZE, ge=1, le=MAX_CHANGES_PAGE_SIZE),
+    last_event_id: str | None = Header(default=None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory)
+):
+    return StreamingResponse(
+        stream_changes(session_factory, last_event_id or since, limit),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.params import Depends
+from api.core.db import engine, get_pool_stats
+from api.schemas.internal import PoolStatsSchema
+from api.services.users import verify_access_token
+
+
+router = APIRouter(
+    prefix='/internal',
+    dependencies=[Depends(verify_access_token)],
+    tags=['Internal']
+)
+
+
+@router.get('/pool', response_model=PoolStatsSchema)
+async def get_pool():
+    return get_pool_stats(engine)
@@ -0,0 +1,61 @@
+import uuid
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.params import Depends
+from api.core.config import job_settings
+from api.core.db import get_db
+from api.core.streams import format_from_content_type
+from api.schemas.applications import ApplicationBulkUpdateStatusSchema
+from api.schemas.jobs import JobSchema
+from api.services.applications import APPLICATION_STATUS_JOB
+from api.services.candidates import CANDIDATE_IMPORT_JOB
+from api.services.jobs import cancel_job, get_job, input_too_large, submit_job
+from api.services.users import verify_access_token
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+router = APIRouter(
+    prefix='/jobs',
+    dependencies=[Depends(verify_access_token)],
+    tags=['Jobs']
+)
+
+
+@router.post('/candidate-import', response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def post_candidate_import_job(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    data_format = format_from_content_type(request.headers.get('content-type'))
+
+    if data_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail='Body must be NDJSON (application/x-ndjson) or CSV (text/csv).'
+        )
+
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > job_settings.max_input_size:
+        raise input_too_large()
+
+    job = await submit_job(db, CANDIDATE_IMPORT_JOB, {'format': data_format.value}, request.stream())
+    response.headers['Location'] = f'{router.prefix}/{job.id}'
+
+    return job
+
+@router.post('/application-status', response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+async def post_application_status_job(
+    bulk_update: ApplicationBulkUpdateStatusSchema, response: Response, db: AsyncSession = Depends(get_db)
+):
+    job = await submit_job(db, APPLICATION_STATUS_JOB, bulk_update.model_dump(mode='json'))
+    response.headers['Location'] = f'{router.prefix}/{job.id}'
+
+    return job
+
+@router.get('/{job_id}', response_model=JobSchema)
+async def get_job_status(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    job = await get_job(db, job_id)
+
+    return job
+
+@router.post('/{job_id}/cancel', response_model=JobSchema)
+async def post_job_cancel(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    job = await cancel_job(db, job_id)
+
+    return job
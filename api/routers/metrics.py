@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from api.core.db import engine, get_pool_stats, replica_engine
+from api.core.metrics import Gauge, registry
+from api.services.users import token_cache
+
+
+router = APIRouter(tags=['Metrics'])
+
+db_pool = registry.register(Gauge(
+    'db_pool_connections', 'Connection pool statistics.', ('database', 'stat')
+))
+token_cache_stats = registry.register(Gauge(
+    'token_cache', 'Access token cache statistics.', ('stat',)
+))
+
+
+def _collect():
+    engines = {'primary': engine, 'replica': replica_engine}
+
+    for database, database_engine in engines.items():
+        if database_engine is not None:
+            for stat, value in get_pool_stats(database_engine).items():
+                db_pool.set(database, stat, value=value)
+
+    for stat, value in token_cache.stats().items():
+        token_cache_stats.set(stat, value=value)
+
+registry.add_collector(_collect)
+
+
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type='text/plain; version=0.0.4')
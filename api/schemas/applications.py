@@ -1,7 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
+from typing import List, Optional
 import uuid
 
+from api.core.config import MAX_BULK_STATUS_UPDATE
 from api.models.applications import ApplicationStatus
 
 
@@ -26,4 +28,39 @@ class ApplicationCreateSchema(BaseModel):
 
 
 class ApplicationUpdateStatusSchema(BaseModel):
-    status: ApplicationStatus
\ No newline at end of file
+    status: ApplicationStatus
+
+
+class ApplicationBulkUpdateStatusSchema(BaseModel):
+    ids: Optional[List[uuid.UUID]] = Field(default=None, max_length=MAX_BULK_STATUS_UPDATE)
+    job_title: Optional[str] = None
+    current_status: Optional[ApplicationStatus] = None
+    status: ApplicationStatus
+
+    @model_validator(mode='after')
+    def check_selection(self):
+        if not self.ids and self.job_title is None and self.current_status is None:
+            raise ValueError('Select applications with ids, job_title or current_status.')
+
+        return self
+
+
+class ApplicationBulkUpdateResultSchema(BaseModel):
+    id: uuid.UUID
+    updated: bool
+    application: Optional[ApplicationSchema] = None
+
+
+class ApplicationBulkUpdateSchema(BaseModel):
+    updated: int = 0
+    not_found: int = 0
+    results: List[ApplicationBulkUpdateResultSchema] = []
+
+
+class ApplicationStatsSchema(BaseModel):
+    job_title: str
+    status: ApplicationStatus
+    count: int
+
+    class Config:
+        from_attributes = True
@@ -1,8 +1,26 @@
+from enum import Enum
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
 from datetime import datetime
 import uuid
 
+from api.schemas.applications import ApplicationSchema
+
+
+class SkillsMatch(str, Enum):
+    ANY = 'any'
+    ALL = 'all'
+
+
+class CountMode(str, Enum):
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+    NONE = 'none'
+
+
+class CandidateInclude(str, Enum):
+    APPLICATIONS = 'applications'
+
 
 class CandidateBaseSchema(BaseModel):
     full_name: str
@@ -34,3 +52,22 @@ class CandidateSchema(CandidateDetailedSchema):
     class Config:
         from_attributes = True
 
+
+class CandidateWithApplicationsSchema(CandidateSchema):
+    applications: List[ApplicationSchema]
+
+
+class CandidateSearchResultSchema(CandidateSchema):
+    score: float
+
+
+class CandidateImportErrorSchema(BaseModel):
+    row: int
+    detail: str
+
+
+class CandidateImportSchema(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[CandidateImportErrorSchema] = []
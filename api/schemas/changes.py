@@ -0,0 +1,26 @@
+from enum import Enum
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+from api.schemas.applications import ApplicationSchema
+from api.schemas.candidates import CandidateSchema
+
+
+class ChangeType(str, Enum):
+    CANDIDATE = 'candidate'
+    APPLICATION = 'application'
+
+
+class ChangeSchema(BaseModel):
+    type: ChangeType
+    id: uuid.UUID
+    updated_at: datetime
+    candidate: Optional[CandidateSchema] = None
+    application: Optional[ApplicationSchema] = None
+
+
+class ChangesPageSchema(BaseModel):
+    changes: List[ChangeSchema]
+    cursor: str  # Pass back as since to continue after the last change
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class PoolStatsSchema(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    total_wait_seconds: float
+    max_wait_seconds: float
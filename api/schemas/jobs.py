@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+import uuid
+
+from api.models.jobs import JobStatus
+
+
+class JobSchema(BaseModel):
+    id: uuid.UUID
+    kind: str
+    status: JobStatus
+    progress: int
+    total: Optional[int] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,8 +1,26 @@
+import uuid
+from collections import Counter
+from datetime import date
+from typing import AsyncIterator, Iterable
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from api.models.applications import Applications
-from api.schemas.applications import ApplicationUpdateStatusSchema
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Date, any_, bindparam, cast, delete, func, insert, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert as pg_insert
+from api.core.changes import notify_changes
+from api.core.config import EXPORT_BATCH_SIZE, MAX_BULK_STATUS_UPDATE
+from api.core.jobs import JobContext, job_handler
+from api.core.pagination import decode_cursor, encode_cursor
+from api.core.streams import DataFormat, export_rows
+from api.models.application_stats import ApplicationStats
+from api.models.applications import ApplicationStatus, Applications
+from api.models.candidates import Candidates
+from api.schemas.applications import (
+    ApplicationBulkUpdateResultSchema, ApplicationBulkUpdateSchema, ApplicationBulkUpdateStatusSchema, 
+    ApplicationSchema, ApplicationStatsSchema, ApplicationUpdateStatusSchema
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+APPLICATION_STATUS_JOB = 'application_status'
 
 
 async def get_applications_list(db: AsyncSession):
@@ -21,21 +39,288 @@ async def get_application_by_id(db: AsyncSession, application_id: str):
     
     return application
     
-async def get_applications_list_by_candidate_id(db: AsyncSession, candidate_id: str):
-    result = await db.execute(
-        select(Applications).where(Applications.candidate_id == candidate_id)
+async def get_applications_list_by_candidate_id(
+    db: AsyncSession, 
+    candidate_id: str, 
+    limit: int | None = None, 
+    cursor: str | None = None, 
+    application_status: ApplicationStatus | None = None
+):
+    query = (
+        select(Applications)
+        .where(Applications.candidate_id == candidate_id)
+        .order_by(Applications.applied_at.desc(), Applications.id.desc())
     )
+
+    if application_status is not None:
+        query = query.where(Applications.status == application_status)
+
+    if cursor:
+        applied_at, application_id = decode_cursor(cursor)
+        query = query.where(tuple_(Applications.applied_at, Applications.id) < (applied_at, application_id))
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
     return result.scalars().all()
 
+def get_applications_next_cursor(applications: list[Applications], limit: int) -> str | None:
+    if not applications or len(applications) < limit:
+        return None
+
+    last_application = applications[-1]
+
+    return encode_cursor(last_application.applied_at, last_application.id)
+
 async def update_application(
-        db: AsyncSession, application_id: str, status: ApplicationUpdateStatusSchema
+        db: AsyncSession, application_id: str, status_update: ApplicationUpdateStatusSchema
+):
+    bumped_candidate = (
+        update(Candidates)
+        .where(
+            Candidates.id == select(Applications.candidate_id)
+            .where(Applications.id == application_id)
+            .scalar_subquery()
+        )
+        .values(version=Candidates.version + 1)
+        .returning(Candidates.id)
+        .cte('bumped_candidate')
+    )
+
+    # The locked pre-image yields the previous status for the funnel aggregates
+    previous_application = (
+        select(Applications.id, Applications.status)
+        .where(Applications.id == application_id)
+        .with_for_update()
+        .cte('previous_application')
+    )
+
+    result = await db.execute(
+        update(Applications)
+        .where(Applications.id == previous_application.c.id)
+        .values(**status_update.model_dump(exclude_unset=True))
+        .returning(Applications, previous_application.c.status)
+        .add_cte(bumped_candidate)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Application not found.')
+
+    updated_application, previous_status = row
+    await record_status_changes(db, [status_change(updated_application, previous_status)])
+    await notify_changes(db)
+    await db.commit()
+
+    return updated_application
+
+def _bulk_update_conditions(bulk_update: ApplicationBulkUpdateStatusSchema) -> list:
+    conditions = []
+
+    if bulk_update.ids:
+        ids = bindparam('ids', bulk_update.ids, type_=ARRAY(UUID(as_uuid=True)))
+        conditions.append(Applications.id == any_(ids))
+    if bulk_update.job_title is not None:
+        conditions.append(Applications.job_title == bulk_update.job_title.lower())
+    if bulk_update.current_status is not None:
+        conditions.append(Applications.status == bulk_update.current_status)
+
+    return conditions
+
+async def _update_selected_applications(
+    db: AsyncSession, conditions: list, new_status: ApplicationStatus
+) -> dict[uuid.UUID, Applications]:
+    # One UPDATE for the whole selection, the ids travel as a single array parameter
+    bumped_candidates = (
+        update(Candidates)
+        .where(Candidates.id.in_(select(Applications.candidate_id).where(*conditions)))
+        .values(version=Candidates.version + 1)
+        .returning(Candidates.id)
+        .cte('bumped_candidates')
+    )
+
+    previous_applications = (
+        select(Applications.id, Applications.status)
+        .where(*conditions)
+        .with_for_update()
+        .cte('previous_applications')
+    )
+
+    # RETURNING with populate_existing refreshes loaded objects, so the ORM does not need to evaluate ANY()
+    result = await db.execute(
+        update(Applications)
+        .where(Applications.id == previous_applications.c.id)
+        .values(status=new_status)
+        .returning(Applications, previous_applications.c.status)
+        .add_cte(bumped_candidates)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+    rows = result.all()
+
+    await record_status_changes(
+        db, [status_change(application, previous_status) for application, previous_status in rows]
+    )
+    if rows:
+        await notify_changes(db)
+    await db.commit()
+
+    return {application.id: application for application, _ in rows}
+
+async def update_applications_status(
+    db: AsyncSession, bulk_update: ApplicationBulkUpdateStatusSchema
+) -> ApplicationBulkUpdateSchema:
+    conditions = _bulk_update_conditions(bulk_update)
+
+    if not bulk_update.ids:
+        # Filters are capped like explicit ids, larger selections belong in a background job
+        selected_ids = list(await db.scalars(
+            select(Applications.id).where(*conditions).limit(MAX_BULK_STATUS_UPDATE + 1)
+        ))
+        if len(selected_ids) > MAX_BULK_STATUS_UPDATE:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=(
+                    f'Selection matches more than {MAX_BULK_STATUS_UPDATE} applications, '
+                    'submit it to POST /jobs/application-status instead.'
+                )
+            )
+        selected = bindparam('selected_ids', selected_ids, type_=ARRAY(UUID(as_uuid=True)))
+        conditions.append(Applications.id == any_(selected))
+
+    updated_applications = await _update_selected_applications(db, conditions, bulk_update.status)
+
+    requested_ids = list(dict.fromkeys(bulk_update.ids)) if bulk_update.ids else list(updated_applications)
+    results = [
+        ApplicationBulkUpdateResultSchema(
+            id=application_id, 
+            updated=application_id in updated_applications, 
+            application=updated_applications.get(application_id)
+        )
+        for application_id in requested_ids
+    ]
+
+    return ApplicationBulkUpdateSchema(
+        updated=len(updated_applications),
+        not_found=len(requested_ids) - len(updated_applications),
+        results=results
+    )
+
+@job_handler(APPLICATION_STATUS_JOB)
+async def run_application_status_job(job: JobContext) -> dict:
+    # Walks the selection in id order one committed batch at a time, a resumed job carries on after the last one
+    bulk_update = ApplicationBulkUpdateStatusSchema.model_validate(job.params)
+    conditions = _bulk_update_conditions(bulk_update)
+    checkpoint = job.checkpoint or {'after_id': None, 'updated': 0}
+    after_id, updated = checkpoint['after_id'], checkpoint['updated']
+
+    async with job.session_factory() as db:
+        if job.checkpoint is None:
+            total = await db.scalar(select(func.count()).select_from(Applications).where(*conditions))
+            await job.report(0, total=total)
+
+        while True:
+            query = (
+                select(Applications.id).where(*conditions).order_by(Applications.id).limit(MAX_BULK_STATUS_UPDATE)
+            )
+            if after_id is not None:
+                query = query.where(Applications.id > uuid.UUID(after_id))
+            batch = list(await db.scalars(query))
+            if not batch:
+                break
+
+            batch_ids = bindparam('batch_ids', batch, type_=ARRAY(UUID(as_uuid=True)))
+            updated += len(await _update_selected_applications(
+                db, [*conditions, Applications.id == any_(batch_ids)], bulk_update.status
+            ))
+            after_id = str(batch[-1])
+            await job.report(updated, checkpoint={'after_id': after_id, 'updated': updated})
+
+    return {'updated': updated}
+
+def status_change(
+    application: Applications, previous_status: ApplicationStatus | None
+) -> tuple[date, str, ApplicationStatus | None, ApplicationStatus | None]:
+    return application.applied_at.date(), application.job_title, previous_status, application.status
+
+async def record_status_changes(
+    db: AsyncSession, changes: Iterable[tuple[date, str, ApplicationStatus | None, ApplicationStatus | None]]
 ):
-    existing_application = await get_application_by_id(db, application_id)
+    """Apply (applied on, job title, old status, new status) transitions to the funnel aggregates.
+
+    Runs inside the caller's transaction, so the aggregates commit or roll back with the applications.
+    """
+    deltas = Counter()
 
-    for field, value in status.model_dump(exclude_unset=True).items():
-        setattr(existing_application, field, value)
+    for applied_on, job_title, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        if old_status is not None:
+            deltas[applied_on, job_title, old_status] -= 1
+        if new_status is not None:
+            deltas[applied_on, job_title, new_status] += 1
+
+    # Sorted keys make concurrent writers lock aggregate rows in the same order
+    rows = [
+        {'applied_on': applied_on, 'job_title': job_title, 'status': application_status, 'count': delta}
+        for (applied_on, job_title, application_status), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    statement = pg_insert(ApplicationStats).values(rows)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[ApplicationStats.applied_on, ApplicationStats.job_title, ApplicationStats.status],
+        set_={'count': ApplicationStats.count + statement.excluded.count}
+    ))
+
+async def get_application_stats(
+    db: AsyncSession, 
+    applied_from: date | None = None, 
+    applied_to: date | None = None, 
+    job_title: str | None = None
+) -> list[ApplicationStatsSchema]:
+    total = func.sum(ApplicationStats.count)
+    query = (
+        select(ApplicationStats.job_title, ApplicationStats.status, total.label('count'))
+        .group_by(ApplicationStats.job_title, ApplicationStats.status)
+        .having(total > 0)
+        .order_by(ApplicationStats.job_title, ApplicationStats.status)
+    )
 
+    if applied_from is not None:
+        query = query.where(ApplicationStats.applied_on >= applied_from)
+    if applied_to is not None:
+        query = query.where(ApplicationStats.applied_on <= applied_to)
+    if job_title is not None:
+        query = query.where(ApplicationStats.job_title == job_title.lower())
+
+    result = await db.execute(query)
+
+    return [ApplicationStatsSchema.model_validate(row) for row in result.all()]
+
+async def rebuild_application_stats(db: AsyncSession) -> int:
+    """Recompute the funnel aggregates from the applications table, for backfills and repairs."""
+    # SHARE mode lets reads continue but holds off status changes until the new aggregates commit
+    await db.execute(text(f'LOCK TABLE {Applications.__tablename__} IN SHARE MODE'))
+    await db.execute(delete(ApplicationStats))
+    result = await db.execute(
+        insert(ApplicationStats).from_select(
+            ['applied_on', 'job_title', 'status', 'count'],
+            select(
+                cast(Applications.applied_at, Date), Applications.job_title, Applications.status, func.count()
+            ).group_by(cast(Applications.applied_at, Date), Applications.job_title, Applications.status)
+        )
+    )
     await db.commit()
-    await db.refresh(existing_application)
 
-    return existing_application
+    return result.rowcount
+
+def export_applications(
+    session_factory: async_sessionmaker[AsyncSession], data_format: DataFormat
+) -> AsyncIterator[str]:
+    query = select(Applications).order_by(Applications.applied_at, Applications.id)
+
+    return export_rows(session_factory, query, ApplicationSchema, data_format, EXPORT_BATCH_SIZE)
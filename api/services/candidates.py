@@ -1,30 +1,210 @@
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable
+import asyncpg
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
-from api.models.applications import Applications
+from pydantic import ValidationError
+from sqlalchemy import Select, cast, func, insert, literal, or_, select, text, tuple_, union_all, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import selectinload
+from api.core.cache import result_cache
+from api.core.changes import notify_changes
+from api.core.config import BULK_IMPORT_BATCH_SIZE, EXPORT_BATCH_SIZE
+from api.core.jobs import JobContext, job_handler
+from api.core.pagination import decode_cursor, encode_cursor
+from api.core.serialization import RowSerializer
+from api.core.streams import DataFormat, export_rows, iter_records
+from api.models.applications import ApplicationStatus, Applications
+from api.models.base import CURRENT_XACT_ID
 from api.models.candidates import Candidates
 from api.schemas.applications import ApplicationCreateSchema
-from api.schemas.candidates import CandidateDetailedSchema, CandidateUpdateSchema
-from api.services.applications import get_applications_list_by_candidate_id
-from sqlalchemy.ext.asyncio import AsyncSession
+from api.schemas.candidates import (
+    CandidateDetailedSchema, CandidateImportErrorSchema, CandidateImportSchema, CandidateSchema, 
+    CandidateUpdateSchema, CountMode, SkillsMatch
+)
+from api.services.applications import get_applications_list_by_candidate_id, record_status_changes, status_change
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
-async def get_candidates_list(db: AsyncSession, offset: int = 0, limit: int = 0, skills: list[str] = []):
-    query = select(Candidates)
+CANDIDATES_CACHE_NAMESPACE = 'candidates'
+CANDIDATE_IMPORT_JOB = 'candidate_import'
 
+candidate_serializer = RowSerializer(CandidateSchema)
+
+
+def _filter_candidates(query: Select, skills: list[str], match: SkillsMatch) -> Select:
     if skills:
         lowered_skills = [skill.lower() for skill in skills]
-        query = query.where(Candidates.skills.op('&&')(lowered_skills))
+        operator = '@>' if match == SkillsMatch.ALL else '&&'
+        query = query.where(Candidates.skills.op(operator)(cast(lowered_skills, Candidates.skills.type)))
+
+    return query
+
+async def get_candidates_list(
+    db: AsyncSession, 
+    offset: int = 0, 
+    limit: int = 0, 
+    skills: list[str] = [], 
+    cursor: str | None = None, 
+    match: SkillsMatch = SkillsMatch.ANY,
+    include_applications: bool = False
+):
+    query = _filter_candidates(select(Candidates), skills, match).order_by(Candidates.created_at, Candidates.id)
+
+    if include_applications:
+        query = query.options(selectinload(Candidates.applications))
+
+    if cursor:
+        created_at, candidate_id = decode_cursor(cursor)
+        query = query.where(tuple_(Candidates.created_at, Candidates.id) > (created_at, candidate_id))
+    else:
+        query = query.offset(offset=offset)
 
-    query = query.offset(offset=offset).limit(limit=limit)
+    query = query.limit(limit=limit)
     result = await db.execute(query)
 
     return result.scalars().all()
 
+def get_candidates_next_cursor(candidates: list[Candidates], limit: int) -> str | None:
+    if not candidates or len(candidates) < limit:
+        return None
+
+    last_candidate = candidates[-1]
+
+    return encode_cursor(last_candidate.created_at, last_candidate.id)
+
+def _candidates_page_cache_key(
+    offset: int, limit: int, skills: list[str], cursor: str | None, match: SkillsMatch
+) -> str:
+    # Skills are matched as a set, so their order, case and duplicates do not change the page
+    normalized = [cursor, 0 if cursor else offset, limit, sorted({skill.lower() for skill in skills}), match.value]
+
+    return hashlib.blake2b(json.dumps(normalized).encode(), digest_size=16).hexdigest()
+
+async def get_candidates_page(
+    db: AsyncSession, 
+    offset: int = 0, 
+    limit: int = 0, 
+    skills: list[str] = [], 
+    cursor: str | None = None, 
+    match: SkillsMatch = SkillsMatch.ANY
+) -> tuple[bytes, str | None]:
+    """Return the rendered JSON and next cursor of a list page, served from the result cache when possible.
+
+    Clients pinned to the primary after a write skip the cache, as a failed invalidation leaves entries
+    from before their write reachable until the TTL. Pages read from a replica are never stored, as they
+    may predate a write the version counter already accounts for.
+    """
+    key = _candidates_page_cache_key(offset, limit, skills, cursor, match)
+    version = await result_cache.version(CANDIDATES_CACHE_NAMESPACE)
+
+    if not db.info.get('pinned_to_primary', False):
+        cached = await result_cache.get(CANDIDATES_CACHE_NAMESPACE, version, key)
+        if cached is not None:
+            next_cursor, body = cached.split(b'\n', 1)
+            return body, next_cursor.decode() or None
+
+    candidates = await get_candidates_list(db, offset, limit, skills, cursor, match)
+    next_cursor = get_candidates_next_cursor(candidates, limit)
+    body = candidate_serializer.dump_json(candidates)
+    if not db.info.get('replica', False):
+        await result_cache.set(
+            CANDIDATES_CACHE_NAMESPACE, version, key, (next_cursor or '').encode() + b'\n' + body
+        )
+
+    return body, next_cursor
+
+async def count_candidates(
+    db: AsyncSession, 
+    skills: list[str] = [], 
+    match: SkillsMatch = SkillsMatch.ANY, 
+    mode: CountMode = CountMode.EXACT
+) -> int | None:
+    if mode == CountMode.NONE:
+        return None
+
+    if mode == CountMode.ESTIMATED:
+        if skills:
+            query = _filter_candidates(select(Candidates.id), skills, match)
+            # Skills stay bound parameters, the statement text is only ever our own compiled SQL
+            connection = await db.connection()
+            compiled = query.compile(dialect=connection.dialect)
+            params = compiled.construct_params()
+            result = await connection.exec_driver_sql(
+                f'EXPLAIN (FORMAT JSON) {compiled}', tuple(params[name] for name in compiled.positiontup)
+            )
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            return int(plan[0]['Plan']['Plan Rows'])
+
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'candidates'::regclass")
+        )
+        # reltuples is -1 until the table has been vacuumed or analyzed for the first time
+        if estimate is not None and estimate >= 0:
+            return estimate
+
+    query = _filter_candidates(select(func.count()).select_from(Candidates), skills, match)
+
+    return await db.scalar(query)
 
-async def get_candidate_by_id(db: AsyncSession, candidate_id: str):
+async def search_candidates(db: AsyncSession, q: str, limit: int = 10) -> list[tuple[Candidates, float]]:
+    term = q.strip().lower()
+    # <% (word similarity) and @@ are served by the trigram and tsvector GIN indexes
+    name_score = func.greatest(
+        func.word_similarity(term, Candidates.full_name), func.word_similarity(term, Candidates.email)
+    )
+    name_matches = (
+        select(Candidates.id.label('candidate_id'), name_score.label('score'))
+        .where(or_(literal(term).op('<%')(Candidates.full_name), literal(term).op('<%')(Candidates.email)))
+        .order_by(name_score.desc())
+        .limit(limit)
+    )
+
+    job_title_query = func.plainto_tsquery('english', term)
+    job_title_score = func.max(func.ts_rank(Applications.job_title_tsv, job_title_query, 32))
+    job_title_matches = (
+        select(Applications.candidate_id, job_title_score.label('score'))
+        .where(Applications.job_title_tsv.op('@@')(job_title_query))
+        .group_by(Applications.candidate_id)
+        .order_by(job_title_score.desc())
+        .limit(limit)
+    )
+
+    matches = union_all(name_matches, job_title_matches).subquery()
+    ranked = (
+        select(matches.c.candidate_id, func.max(matches.c.score).label('score'))
+        .group_by(matches.c.candidate_id)
+        .subquery()
+    )
     result = await db.execute(
-        select(Candidates).where(Candidates.id == candidate_id)
+        select(Candidates, ranked.c.score)
+        .join(ranked, ranked.c.candidate_id == Candidates.id)
+        .order_by(ranked.c.score.desc(), Candidates.id)
+        .limit(limit)
     )
+
+    return result.tuples().all()
+
+async def get_candidate_version(db: AsyncSession, candidate_id: str) -> int:
+    version = await db.scalar(select(Candidates.version).where(Candidates.id == candidate_id))
+
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Candidate not found.')
+
+    return version
+
+async def get_candidate_by_id(db: AsyncSession, candidate_id: str, include_applications: bool = False):
+    query = select(Candidates).where(Candidates.id == candidate_id)
+
+    if include_applications:
+        query = query.options(selectinload(Candidates.applications))
+
+    result = await db.execute(query)
     candidate = result.scalar_one_or_none()
 
     if candidate is None:
@@ -32,53 +212,269 @@ async def get_candidate_by_id(db: AsyncSession, candidate_id: str):
     
     return candidate
 
+def normalize_candidate(candidate: CandidateDetailedSchema) -> dict:
+    return {
+        'full_name': candidate.full_name.lower(),
+        'email': str(candidate.email.lower()),
+        'phone': candidate.phone,
+        'skills': [skill.lower() for skill in candidate.skills],
+    }
+
 async def create_candidate(db: AsyncSession, candidate: CandidateDetailedSchema):
-    new_candidate = Candidates(
-        full_name=candidate.full_name.lower(),
-        email=str(candidate.email.lower()),
-        phone=candidate.phone,
-        skills=[skill.lower() for skill in candidate.skills],
+    result = await db.execute(
+        insert(Candidates).values(**normalize_candidate(candidate)).returning(Candidates)
     )
-
-    db.add(new_candidate)
+    new_candidate = result.scalar_one()
+    await notify_changes(db)
     await db.commit()
-    await db.refresh(new_candidate)
+    await result_cache.invalidate(CANDIDATES_CACHE_NAMESPACE)
 
     return new_candidate
 
 async def update_candidate(db: AsyncSession, candidate_id: str, candidate: CandidateUpdateSchema):
-    existing_candidate = await get_candidate_by_id(db, candidate_id)
+    values = {}
 
     for field, value in candidate.model_dump(exclude_unset=True).items():
         if isinstance(value, str):
             value = value.lower()
         elif isinstance(value, list):
             value = [v.lower() if isinstance(v, str) else v for v in value]
-        setattr(existing_candidate, field, value)
+        values[field] = value
+
+    if not values:
+        return await get_candidate_by_id(db, candidate_id)
+
+    result = await db.execute(
+        update(Candidates)
+        .where(Candidates.id == candidate_id)
+        .values(**values, version=Candidates.version + 1)
+        .returning(Candidates)
+        .execution_options(populate_existing=True)
+    )
+    updated_candidate = result.scalar_one_or_none()
+
+    if updated_candidate is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Candidate not found.')
 
+    await notify_changes(db)
     await db.commit()
-    await db.refresh(existing_candidate)
+    await result_cache.invalidate(CANDIDATES_CACHE_NAMESPACE)
 
-    return existing_candidate
+    return updated_candidate
 
-async def get_applications_by_candidate_id(db: AsyncSession, candidate_id: str):
-    existing_candidate = await get_candidate_by_id(db, candidate_id)
-    applications = await get_applications_list_by_candidate_id(db, existing_candidate.id)
+async def get_applications_by_candidate_id(
+    db: AsyncSession, 
+    candidate_id: str, 
+    limit: int | None = None, 
+    cursor: str | None = None, 
+    application_status: ApplicationStatus | None = None
+):
+    await get_candidate_version(db, candidate_id)
+    applications = await get_applications_list_by_candidate_id(
+        db, candidate_id, limit, cursor, application_status
+    )
 
     return applications
     
 async def create_candidate_application(db: AsyncSession, candidate_id: str, application: ApplicationCreateSchema):
-    candidate = await get_candidate_by_id(db, candidate_id)
+    # Bumping the candidate version and inserting happen in one statement, an unknown candidate inserts nothing
+    bumped_candidate = (
+        update(Candidates)
+        .where(Candidates.id == candidate_id)
+        .values(version=Candidates.version + 1)
+        .returning(Candidates.id)
+        .cte('bumped_candidate')
+    )
+    columns = Applications.__table__.c
 
-    new_application = Applications(
-        candidate_id=candidate.id,
-        job_title=func.lower(application.job_title),
-        status=application.status,
-        applied_at=application.applied_at.replace(tzinfo=None),
+    result = await db.execute(
+        insert(Applications).from_select(
+            ['id', 'candidate_id', 'job_title', 'status', 'applied_at'],
+            select(
+                literal(uuid.uuid4(), columns.id.type),
+                bumped_candidate.c.id,
+                func.lower(application.job_title),
+                literal(application.status, columns.status.type),
+                literal(application.applied_at.replace(tzinfo=None), columns.applied_at.type),
+            )
+        ).returning(Applications)
     )
+    new_application = result.scalar_one_or_none()
+
+    if new_application is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Candidate not found.')
 
-    db.add(new_application)
+    await record_status_changes(db, [status_change(new_application, None)])
+    await notify_changes(db)
     await db.commit()
-    await db.refresh(new_application)
 
-    return new_application
\ No newline at end of file
+    return new_application
+
+
+def _check_import_text(value, field: str):
+    # PostgreSQL text cannot hold NUL characters or unpaired surrogates, reject them before they fail a batch
+    if isinstance(value, list):
+        for item in value:
+            _check_import_text(item, field)
+    elif isinstance(value, str):
+        if '\x00' in value:
+            raise ValueError(f'{field}: NUL characters are not allowed')
+        try:
+            value.encode()
+        except UnicodeEncodeError:
+            raise ValueError(f'{field}: invalid text')
+
+def _parse_import_record(record: dict, data_format: DataFormat) -> CandidateDetailedSchema:
+    if data_format == DataFormat.CSV:
+        record = {
+            **record,
+            'phone': record.get('phone') or None,
+            'skills': [skill.strip() for skill in record.get('skills', '').split(';') if skill.strip()],
+        }
+
+    for field, value in record.items():
+        _check_import_text(value, str(field))
+
+    return CandidateDetailedSchema.model_validate(record)
+
+def _import_error(result: CandidateImportSchema, row: int, detail: str):
+    result.failed += 1
+    result.errors.append(CandidateImportErrorSchema(row=row, detail=detail))
+
+async def _merge_candidates_batch(db: AsyncSession, batch: dict[str, tuple[int, dict]], result: CandidateImportSchema):
+    """Merge a batch, splitting it in halves on a database error until the rejected rows are isolated."""
+    try:
+        await _copy_and_merge(db, batch, result)
+    except (asyncpg.PostgresError, DBAPIError) as e:
+        if isinstance(e, DBAPIError) and e.connection_invalidated:
+            raise
+        await db.rollback()
+
+        if len(batch) == 1:
+            (row, _), = batch.values()
+            _import_error(result, row, str(getattr(e, 'orig', None) or e))
+            return
+
+        items = list(batch.items())
+        half = len(items) // 2
+        await _merge_candidates_batch(db, dict(items[:half]), result)
+        await _merge_candidates_batch(db, dict(items[half:]), result)
+
+async def _copy_and_merge(db: AsyncSession, batch: dict[str, tuple[int, dict]], result: CandidateImportSchema):
+    await db.execute(text(
+        'CREATE TEMP TABLE candidates_staging ('
+        'id uuid, full_name text, email text, phone text, skills text[], created_at timestamp'
+        ') ON COMMIT DROP'
+    ))
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    created_at = datetime.now()
+    await raw_connection.driver_connection.copy_records_to_table(
+        'candidates_staging',
+        columns=['id', 'full_name', 'email', 'phone', 'skills', 'created_at'],
+        records=[
+            (uuid.uuid4(), row['full_name'], row['email'], row['phone'], row['skills'], created_at)
+            for _, row in batch.values()
+        ],
+    )
+
+    merged = await db.execute(text(
+        'INSERT INTO candidates (id, full_name, email, phone, skills, created_at) '
+        'SELECT id, full_name, email, phone, skills, created_at FROM candidates_staging '
+        'ON CONFLICT (email) DO UPDATE SET '
+        'full_name = EXCLUDED.full_name, phone = EXCLUDED.phone, skills = EXCLUDED.skills, '
+        f'version = candidates.version + 1, updated_at = localtimestamp, change_xid = {CURRENT_XACT_ID} '
+        'RETURNING (xmax = 0) AS inserted'
+    ))
+    inserted_rows = merged.scalars().all()
+    await notify_changes(db)
+    await db.commit()
+    await result_cache.invalidate(CANDIDATES_CACHE_NAMESPACE)
+
+    for inserted in inserted_rows:
+        if inserted:
+            result.inserted += 1
+        else:
+            result.updated += 1
+
+async def import_candidates(
+    db: AsyncSession, 
+    chunks: AsyncIterator[bytes], 
+    data_format: DataFormat,
+    result: CandidateImportSchema | None = None,
+    after_row: int = 0,
+    on_batch: Callable[[int, CandidateImportSchema], Awaitable[None]] | None = None
+) -> CandidateImportSchema:
+    """Upsert candidates by email in committed batches.
+
+    Every row ends up counted as inserted, updated or failed. Rows the database rejects are reported
+    as errors while the rest of their batch commits, and a row repeating an email already in its
+    batch replaces the earlier one, which is reported as an error.
+
+    Resuming jobs pass the result so far and the last row it covers, rows up to after_row are skipped.
+    on_batch runs after every committed batch with the last row it included.
+    """
+    result = result or CandidateImportSchema()
+    batch: dict[str, tuple[int, dict]] = {}
+    row = after_row
+
+    async for row, record, error in iter_records(chunks, data_format):
+        if row <= after_row:
+            continue
+
+        if record is not None:
+            try:
+                candidate = normalize_candidate(_parse_import_record(record, data_format))
+            except ValidationError as e:
+                error = '; '.join(
+                    f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+                )
+            except ValueError as e:
+                error = str(e)
+
+        if error is not None:
+            _import_error(result, row, error)
+            continue
+
+        superseded = batch.pop(candidate['email'], None)
+        if superseded is not None:
+            _import_error(result, superseded[0], f'email: replaced by row {row} with the same email')
+
+        batch[candidate['email']] = (row, candidate)
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            await _merge_candidates_batch(db, batch, result)
+            batch = {}
+            if on_batch is not None:
+                await on_batch(row, result)
+
+    if batch:
+        await _merge_candidates_batch(db, batch, result)
+
+    if on_batch is not None:
+        await on_batch(row, result)
+
+    return result
+
+@job_handler(CANDIDATE_IMPORT_JOB)
+async def run_candidate_import_job(job: JobContext) -> dict:
+    checkpoint = job.checkpoint or {}
+    result = CandidateImportSchema.model_validate(checkpoint.get('result', {}))
+
+    async def on_batch(row: int, result: CandidateImportSchema):
+        await job.report(row, checkpoint={'row': row, 'result': result.model_dump(mode='json')})
+
+    async with job.session_factory() as db:
+        await import_candidates(
+            db, job.iter_input(), DataFormat(job.params['format']), 
+            result, checkpoint.get('row', 0), on_batch
+        )
+
+    return result.model_dump(mode='json')
+
+def export_candidates(
+    session_factory: async_sessionmaker[AsyncSession], data_format: DataFormat
+) -> AsyncIterator[str]:
+    query = select(Candidates).order_by(Candidates.created_at, Candidates.id)
+
+    return export_rows(session_factory, query, CandidateSchema, data_format, EXPORT_BATCH_SIZE)
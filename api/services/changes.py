@@ -0,0 +1,117 @@
+import asyncio
+import base64
+import json
+import uuid
+from contextlib import suppress
+from typing import AsyncIterator
+from fastapi import HTTPException, status
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from api.core.changes import ChangeListener, change_listener
+from api.core.config import CHANGES_POLL_INTERVAL
+from api.models.applications import Applications
+from api.models.candidates import Candidates
+from api.schemas.applications import ApplicationSchema
+from api.schemas.candidates import CandidateSchema
+from api.schemas.changes import ChangeSchema, ChangesPageSchema, ChangeType
+
+
+# Position in this tuple breaks ties between tables written by the same transaction
+CHANGE_SOURCES = (
+    (ChangeType.CANDIDATE, Candidates, CandidateSchema),
+    (ChangeType.APPLICATION, Applications, ApplicationSchema),
+)
+
+NIL_ID = uuid.UUID(int=0)
+
+# Every transaction below this xid has finished, so no row can still appear with a smaller change_xid
+SNAPSHOT_XMIN = text('SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint')
+
+
+def encode_change_cursor(change_xid: int, source: int, row_id: uuid.UUID) -> str:
+    payload = json.dumps([change_xid, source, str(row_id)], separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_change_cursor(cursor: str) -> tuple[int, int, uuid.UUID]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        change_xid, source, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+        return int(change_xid), int(source), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor.')
+
+async def _fetch_changes(db: AsyncSession, since: str | None, limit: int) -> list[tuple[str, ChangeSchema]]:
+    since_xid, since_source, since_id = decode_change_cursor(since) if since else (0, 0, NIL_ID)
+    horizon = await db.scalar(SNAPSHOT_XMIN)
+    rows = []
+
+    for source, (change_type, model, schema) in enumerate(CHANGE_SOURCES):
+        if source > since_source:
+            after = model.change_xid >= since_xid
+        elif source == since_source:
+            after = tuple_(model.change_xid, model.id) > tuple_(since_xid, since_id)
+        else:
+            after = model.change_xid > since_xid
+
+        result = await db.execute(
+            select(model, model.change_xid)
+            .where(after, model.change_xid < horizon)
+            .order_by(model.change_xid, model.id)
+            .limit(limit)
+        )
+        for row, change_xid in result.all():
+            change = ChangeSchema(
+                type=change_type, id=row.id, updated_at=row.updated_at, 
+                **{change_type.value: schema.model_validate(row)}
+            )
+            rows.append((change_xid, source, row.id, change))
+
+    rows.sort(key=lambda row: row[:3])
+
+    return [(encode_change_cursor(*row[:3]), row[3]) for row in rows[:limit]]
+
+async def get_changes(db: AsyncSession, since: str | None, limit: int) -> ChangesPageSchema:
+    """Return up to limit changed rows after since, oldest transaction first.
+
+    Rows written by transactions that are still running, or that started before one still running,
+    are held back until it finishes, so a client that follows the cursor never skips a row.
+    """
+    changes = await _fetch_changes(db, since, limit)
+    cursor = changes[-1][0] if changes else since or encode_change_cursor(0, 0, NIL_ID)
+
+    return ChangesPageSchema(changes=[change for _, change in changes], cursor=cursor)
+
+async def stream_changes(
+    session_factory: async_sessionmaker[AsyncSession], 
+    since: str | None, 
+    limit: int,
+    listener: ChangeListener = change_listener,
+    poll_interval: float = CHANGES_POLL_INTERVAL
+) -> AsyncIterator[str]:
+    """Yield changes as Server-Sent Events, waking on NOTIFY and polling as a fallback.
+
+    Each event id is the cursor after that change, so a reconnecting client resumes with Last-Event-ID.
+    """
+    await listener.start()
+    cursor = since
+
+    while True:
+        changed = listener.changed()
+        async with session_factory() as db:
+            changes = await _fetch_changes(db, cursor, limit)
+
+        for cursor, change in changes:
+            yield f'id: {cursor}\nevent: {change.type.value}\ndata: {change.model_dump_json()}\n\n'
+
+        if len(changes) == limit:
+            continue
+
+        if not changed.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(changed.wait(), poll_interval)
+            if not changed.is_set():
+                # Keeps proxies from closing an idle stream, and restarts the listener if it dropped
+                yield ': keepalive\n\n'
+                await listener.start()
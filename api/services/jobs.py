@@ -0,0 +1,92 @@
+import uuid
+from typing import AsyncIterator
+from fastapi import HTTPException, status
+from sqlalchemy import case, delete, func, insert, literal, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.core.config import JOB_INPUT_CHUNK_SIZE, job_settings
+from api.core.jobs import UNFINISHED_STATUSES, job_handlers, job_runner
+from api.models.jobs import JobInputChunks, JobStatus, Jobs
+
+
+def input_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f'Job input is limited to {job_settings.max_input_size} bytes.'
+    )
+
+async def _store_input(db: AsyncSession, job_id: uuid.UUID, chunks: AsyncIterator[bytes]):
+    # Written in bounded chunks as it arrives, so no upload is ever held in memory whole
+    buffer = bytearray()
+    size = 0
+    seq = 0
+
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > job_settings.max_input_size:
+            raise input_too_large()
+
+        buffer += chunk
+        while len(buffer) >= JOB_INPUT_CHUNK_SIZE:
+            await db.execute(
+                insert(JobInputChunks).values(job_id=job_id, seq=seq, data=bytes(buffer[:JOB_INPUT_CHUNK_SIZE]))
+            )
+            del buffer[:JOB_INPUT_CHUNK_SIZE]
+            seq += 1
+
+    if buffer:
+        await db.execute(insert(JobInputChunks).values(job_id=job_id, seq=seq, data=bytes(buffer)))
+
+async def submit_job(
+    db: AsyncSession, kind: str, params: dict, input: AsyncIterator[bytes] | None = None
+) -> Jobs:
+    """Queue a job, storing its input first: runners only see it once the whole input is committed."""
+    if kind not in job_handlers:
+        raise ValueError(f'No handler registered for job kind {kind!r}')
+
+    job = Jobs(kind=kind, params=params)
+    db.add(job)
+    if input is not None:
+        await db.flush()
+        try:
+            await _store_input(db, job.id, input)
+        except BaseException:
+            await db.rollback()
+            raise
+    await db.commit()
+    job_runner.notify()
+
+    return job
+
+async def get_job(db: AsyncSession, job_id: uuid.UUID) -> Jobs:
+    job = await db.get(Jobs, job_id)
+
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Job not found.')
+
+    return job
+
+async def cancel_job(db: AsyncSession, job_id: uuid.UUID) -> Jobs:
+    # Queued jobs are cancelled on the spot, running ones stop at their next progress report or heartbeat
+    queued = Jobs.status == JobStatus.QUEUED
+    job = await db.scalar(
+        update(Jobs)
+        .where(Jobs.id == job_id, Jobs.status.in_(UNFINISHED_STATUSES))
+        .values(
+            cancel_requested=True,
+            status=case((queued, literal(JobStatus.CANCELLED, Jobs.status.type)), else_=Jobs.status),
+            finished_at=case((queued, func.now()), else_=Jobs.finished_at)
+        )
+        .returning(Jobs)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+
+    if job is None:
+        job = await get_job(db, job_id)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f'Job already {job.status.value}.')
+
+    if job.status == JobStatus.CANCELLED:
+        await db.execute(delete(JobInputChunks).where(JobInputChunks.job_id == job_id))
+    await db.commit()
+    job_runner.cancel_local(job_id)
+
+    return job
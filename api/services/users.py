@@ -1,9 +1,14 @@
+import asyncio
+import secrets
 import jwt
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from fastapi import HTTPException, status
 from fastapi.params import Depends
 from datetime import datetime, timedelta, timezone
 from sqlalchemy import select
-from api.core.config import ALGORITHM, SECRET_KEY
+from api.core.cache import LRUCache
+from api.core.config import ALGORITHM, PASSWORD_HASH_WORKERS, SECRET_KEY, TOKEN_CACHE_SIZE
 from api.models.users import Users
 from api.schemas.users import AccessTokenDataSchema, UserLoginSchema
 from passlib.context import CryptContext
@@ -15,24 +20,51 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login')
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+token_cache = LRUCache(maxsize=TOKEN_CACHE_SIZE)
 
 
-def verify_password(plain_pw, hashed_pw):
-    return pwd_context.verify(plain_pw, hashed_pw)
+@cache
+def _dummy_password_hash() -> str:
+    # Hashed on first use in the password executor, so importing this module never pays for bcrypt
+    return pwd_context.hash(secrets.token_urlsafe())
 
-def get_hashed_password(password):
-    return pwd_context.hash(password)
+def _verify_unknown_user_password(plain_pw):
+    # Spend the same bcrypt cost as a real check so unknown emails cannot be told apart by timing
+    pwd_context.verify(plain_pw, _dummy_password_hash())
+    return False, None
+
+async def _run_in_password_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+async def verify_password(plain_pw, hashed_pw):
+    return await _run_in_password_executor(pwd_context.verify, plain_pw, hashed_pw)
+
+async def verify_and_update_password(plain_pw, hashed_pw):
+    if hashed_pw is None:
+        return await _run_in_password_executor(_verify_unknown_user_password, plain_pw)
+
+    return await _run_in_password_executor(pwd_context.verify_and_update, plain_pw, hashed_pw)
+
+async def get_hashed_password(password):
+    return await _run_in_password_executor(pwd_context.hash, password)
 
 async def authenticate_user(db: AsyncSession, user: UserLoginSchema):
     try:
         result = await db.execute(select(Users).where(Users.email == user.email))
         db_user = result.scalar_one_or_none()
-    
-        if not user:
-            return False
-        
-        if not verify_password(user.password, db_user.password):
+
+        verified, new_hash = await verify_and_update_password(
+            user.password, db_user.password if db_user else None
+        )
+
+        if db_user is None or not verified:
             return False
+
+        if new_hash is not None:
+            db_user.password = new_hash
+            await db.commit()
     
         return db_user
     except Exception as e:
@@ -60,12 +92,19 @@ def verify_access_token(token: Annotated[str, Depends(oauth2_scheme)]):
         headers={'WWW-Authenticate': 'Bearer'},
     )
     
+    cached_email = token_cache.get(token)
+    if cached_email is not None:
+        return AccessTokenDataSchema(email=cached_email)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get('sub')
         
         if email is None:
             raise credentials_exception
+
+        if 'exp' in payload:
+            token_cache.set(token, email, payload['exp'])
         return AccessTokenDataSchema(email=email)
     except InvalidTokenError:
         raise credentials_exception
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from api.core.config import DEFAULT_PAGINATION_LIMIT, database_settings
+from api.core.db import engine, replica_engine
+from api.models.users import Users
+from api.schemas.candidates import SkillsMatch
+from api.services.applications import get_applications_list_by_candidate_id
+from api.services.candidates import get_candidate_by_id, get_candidate_version, get_candidates_list
+
+
+logger = logging.getLogger(__name__)
+
+NIL_ID = '00000000-0000-0000-0000-000000000000'
+MAX_RETRY_DELAY = 30.0
+
+
+async def _run_hot_queries(connection: AsyncConnection):
+    # Same statements the busiest endpoints issue, so their SQL is compiled and prepared before traffic
+    async with AsyncSession(bind=connection) as db:
+        await get_candidates_list(db, limit=DEFAULT_PAGINATION_LIMIT)
+        await get_candidates_list(db, limit=DEFAULT_PAGINATION_LIMIT, skills=['python'])
+        await get_candidates_list(db, limit=DEFAULT_PAGINATION_LIMIT, skills=['python'], match=SkillsMatch.ALL)
+        await get_applications_list_by_candidate_id(db, NIL_ID, DEFAULT_PAGINATION_LIMIT)
+        await db.execute(select(Users).where(Users.email == ''))
+
+        for lookup in (get_candidate_version, get_candidate_by_id):
+            try:
+                await lookup(db, NIL_ID)
+            except HTTPException:
+                pass
+
+async def warm_up_engine(database_engine: AsyncEngine, connections: int):
+    """Fill the pool with connections that have already run and prepared the hot queries.
+
+    All connections are held at once, so the pool really opens that many instead of reusing one.
+    """
+    async with AsyncExitStack() as stack:
+        opened = [await stack.enter_async_context(database_engine.connect()) for _ in range(connections)]
+        await asyncio.gather(*(_run_hot_queries(connection) for connection in opened))
+
+async def warm_up(state):
+    """Warm the primary, retrying with backoff until it answers, flag state as ready, then warm the replica.
+
+    The replica is warmed once and best-effort: reads fall back to the primary while it is unreachable,
+    so it never holds up readiness.
+    """
+    # Connections beyond pool_size are overflow and would be closed as soon as warmup returns them
+    connections = database_settings.warmup_connections
+    if connections is None or connections > database_settings.pool_size:
+        connections = database_settings.pool_size
+    delay = 1.0
+
+    while True:
+        try:
+            await warm_up_engine(engine, connections)
+            break
+        except Exception as e:
+            # Anything escaping here would end the task silently and leave /ready at 503 for good
+            logger.warning('Warmup failed, retrying in %.0f seconds: %s: %s', delay, type(e).__name__, e)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    state.ready = True
+
+    if replica_engine is not None:
+        try:
+            await warm_up_engine(replica_engine, connections)
+        except Exception as e:
+            logger.warning('Replica warmup failed, its pool fills on demand: %s: %s', type(e).__name__, e)
@@ -4,7 +4,7 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from api.core.db import Base, get_db
+from api.core.db import Base, get_db, get_read_db, get_read_session_factory, get_session_factory
 from api.models.applications import Applications
 from api.models.candidates import Candidates
 from api.schemas.users import AccessTokenDataSchema
@@ -40,14 +40,20 @@ async def async_session(test_engine):
         yield session
 
 @pytest.fixture
-async def async_client(async_session):
+async def async_client(async_session, test_engine):
     async def override_get_db():
         yield async_session
 
     async def override_verify_access_token():
         return AccessTokenDataSchema(email='admin@example.com')
 
+    def override_get_session_factory():
+        return async_sessionmaker(bind=test_engine, expire_on_commit=False)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
+    app.dependency_overrides[get_read_session_factory] = override_get_session_factory
     app.dependency_overrides[verify_access_token] = override_verify_access_token
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
@@ -3,8 +3,9 @@ from fastapi import HTTPException
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.schemas.applications import ApplicationUpdateStatusSchema
-from api.services.applications import get_application_by_id, get_applications_list, get_applications_list_by_candidate_id, update_application
+from api.models.candidates import Candidates
+from api.schemas.applications import ApplicationBulkUpdateStatusSchema, ApplicationUpdateStatusSchema
+from api.services.applications import get_application_by_id, get_application_stats, get_applications_list, get_applications_list_by_candidate_id, rebuild_application_stats, update_application, update_applications_status
 
 
 # Endpoint tests
@@ -37,6 +38,93 @@ async def test_update_application(async_client, seeded_candidates, seeded_candid
     assert update_response.status_code == 200
     assert update_response.json()['status'] == 'interviewing'
 
+@pytest.mark.anyio
+async def test_update_applications_status(async_client, seeded_candidates, seeded_candidate_application):
+    missing_id = '3fa85f64-5717-4562-b3fc-2c963f66afb5'
+    response = await async_client.patch(
+        '/applications', 
+        json={'ids': ['3fa85f64-5717-4562-b3fc-2c963f66afb1', missing_id], 'status': 'rejected'}
+    )
+    result = response.json()
+
+    assert response.status_code == 200
+    assert result['updated'] == 1
+    assert result['not_found'] == 1
+    assert result['results'][0]['application']['status'] == 'rejected'
+    assert result['results'][1] == {'id': missing_id, 'updated': False, 'application': None}
+
+@pytest.mark.anyio
+async def test_update_applications_status_filter_over_limit(
+    async_client, seeded_candidates, seeded_candidate_application, monkeypatch
+):
+    monkeypatch.setattr('api.services.applications.MAX_BULK_STATUS_UPDATE', 0)
+    response = await async_client.patch('/applications', json={'current_status': 'applied', 'status': 'rejected'})
+    application = await async_client.get('/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1/applications')
+
+    assert response.status_code == 422
+    assert application.json()[0]['status'] == 'applied'
+
+@pytest.mark.anyio
+async def test_update_applications_status_without_selection(async_client):
+    response = await async_client.patch('/applications', json={'status': 'rejected'})
+
+    assert response.status_code == 422
+
+@pytest.mark.anyio
+async def test_get_applications_stats(async_client, seeded_candidates):
+    candidate_url = '/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1/applications'
+    applications = [
+        {'job_title': 'Data Engineer', 'status': 'applied', 'applied_at': '2025-07-01T09:00:00'},
+        {'job_title': 'Data Engineer', 'status': 'applied', 'applied_at': '2025-07-02T09:00:00'},
+        {'job_title': 'Designer', 'status': 'applied', 'applied_at': '2025-07-03T09:00:00'},
+    ]
+    created = [(await async_client.post(candidate_url, json=payload)).json() for payload in applications]
+    await async_client.patch(f"/applications/{created[0]['id']}", json={'status': 'interviewing'})
+
+    everything = await async_client.get('/applications/stats')
+    window = await async_client.get(
+        '/applications/stats', params={'applied_from': '2025-07-02', 'applied_to': '2025-07-02'}
+    )
+
+    assert everything.json() == [
+        {'job_title': 'data engineer', 'status': 'applied', 'count': 1},
+        {'job_title': 'data engineer', 'status': 'interviewing', 'count': 1},
+        {'job_title': 'designer', 'status': 'applied', 'count': 1},
+    ]
+    assert window.json() == [{'job_title': 'data engineer', 'status': 'applied', 'count': 1}]
+
+@pytest.mark.anyio
+async def test_export_applications_csv(async_client, seeded_candidates, seeded_candidate_application):
+    response = await async_client.get('/applications/export', params={'format': 'csv'})
+    header, row = response.text.splitlines()
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+    assert header == 'candidate_id,job_title,status,applied_at,id'
+    assert row.endswith(',Sofware Developer,applied,2025-07-01T17:57:03.364000,3fa85f64-5717-4562-b3fc-2c963f66afb1')
+
+@pytest.mark.anyio
+async def test_get_candidate_applications_paginated(async_client, seeded_candidates, seeded_candidate_application):
+    candidate_id = '3fa85f64-5717-4562-b3fc-2c963f66afa1'
+    await async_client.post(
+        f'/candidates/{candidate_id}/applications', 
+        json={'job_title': 'Data Engineer', 'status': 'interviewing', 'applied_at': '2025-07-02T09:00:00'}
+    )
+
+    first_page = await async_client.get(f'/candidates/{candidate_id}/applications', params={'limit': 1})
+    second_page = await async_client.get(
+        f'/candidates/{candidate_id}/applications', 
+        params={'limit': 1, 'cursor': first_page.headers['X-Next-Cursor']}
+    )
+    filtered = await async_client.get(
+        f'/candidates/{candidate_id}/applications', params={'status': 'interviewing'}
+    )
+
+    assert first_page.json()[0]['job_title'] == 'data engineer'
+    assert second_page.json()[0]['job_title'] == 'Sofware Developer'
+    assert [application['job_title'] for application in filtered.json()] == ['data engineer']
+    assert 'X-Next-Cursor' not in filtered.headers
+
 
 # Service tests
 
@@ -109,3 +197,55 @@ async def test_update_application_not_found(
         )
 
     assert exc_info.value.status_code == 404
+
+# Test for update_applications_status()
+@pytest.mark.anyio
+async def test_update_applications_status_by_filter(
+    async_session: AsyncSession, 
+    seeded_candidates, 
+    seeded_candidate_application
+):
+    # The API stores job titles lowercased, the fixture does not
+    seeded_candidate_application.job_title = 'sofware developer'
+    await async_session.commit()
+    payload = ApplicationBulkUpdateStatusSchema(
+        job_title='Sofware Developer', current_status='applied', status='rejected'
+    )
+
+    result = await update_applications_status(async_session, payload)
+    candidate = await async_session.get(Candidates, seeded_candidate_application.candidate_id)
+    await async_session.refresh(candidate)
+
+    assert result.updated == 1
+    assert result.results[0].application.status == 'rejected'
+    assert candidate.version == 2
+
+# Tests for application stats
+@pytest.mark.anyio
+async def test_update_applications_status_stats(
+    async_session: AsyncSession, 
+    seeded_candidates, 
+    seeded_candidate_application
+):
+    # The API stores job titles lowercased, the fixture does not
+    seeded_candidate_application.job_title = 'sofware developer'
+    await async_session.commit()
+    await rebuild_application_stats(async_session)
+    payload = ApplicationBulkUpdateStatusSchema(ids=[seeded_candidate_application.id], status='hired')
+
+    await update_applications_status(async_session, payload)
+    stats = await get_application_stats(async_session, job_title='Sofware Developer')
+
+    assert [(row.status, row.count) for row in stats] == [('hired', 1)]
+
+@pytest.mark.anyio
+async def test_rebuild_application_stats(
+    async_session: AsyncSession, 
+    seeded_candidates, 
+    seeded_candidate_application
+):
+    rows = await rebuild_application_stats(async_session)
+    stats = await get_application_stats(async_session)
+
+    assert rows == 1
+    assert [(row.job_title, row.status, row.count) for row in stats] == [('Sofware Developer', 'applied', 1)]
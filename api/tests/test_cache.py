@@ -0,0 +1,177 @@
+import asyncio
+import time
+import pytest
+from sqlalchemy import event
+
+from api.core.cache import (
+    CacheError, MemoryCacheBackend, RedisCacheBackend, ResultCache, encode_command, read_reply, result_cache
+)
+from api.services.candidates import get_candidates_page
+
+
+@pytest.fixture
+async def redis_stand_in():
+    """Serves GET, SET with PX, INCR and SELECT over the Redis protocol from a dict."""
+    store = {}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                command, *args = await read_reply(reader)
+                name = command.decode().upper()
+                if name == 'GET':
+                    value, expires_at = store.get(args[0], (None, None))
+                    if expires_at is not None and expires_at <= time.time():
+                        value = None
+                    writer.write(b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value))
+                elif name == 'SET':
+                    expires_at = time.time() + int(args[3]) / 1000 if len(args) > 3 else None
+                    store[args[0]] = (args[1], expires_at)
+                    writer.write(b'+OK\r\n')
+                elif name == 'INCR':
+                    value = int(store.get(args[0], (b'0', None))[0]) + 1
+                    store[args[0]] = (str(value).encode(), None)
+                    writer.write(b':%d\r\n' % value)
+                elif name == 'SELECT':
+                    writer.write(b'+OK\r\n')
+                else:
+                    writer.write(b'-ERR unknown command\r\n')
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f'redis://127.0.0.1:{port}/1'
+    server.close()
+    await server.wait_closed()
+
+
+# Unit tests
+
+# Tests for the Redis protocol helpers
+@pytest.mark.anyio
+async def test_encode_command():
+    assert encode_command('SET', 'key', b'value', 'PX', 100) == (
+        b'*5\r\n$3\r\nSET\r\n$3\r\nkey\r\n$5\r\nvalue\r\n$2\r\nPX\r\n$3\r\n100\r\n'
+    )
+
+@pytest.mark.anyio
+async def test_redis_backend(redis_stand_in):
+    backend = RedisCacheBackend(redis_stand_in, timeout=1.0)
+
+    await backend.set('page', b'[]', ttl=30)
+
+    assert await backend.get('page') == b'[]'
+    assert await backend.get('missing') is None
+    assert await backend.get_counter('version') == 0
+    assert await backend.incr('version') == 1
+    assert await backend.get_counter('version') == 1
+    await backend.close()
+
+@pytest.mark.anyio
+async def test_redis_backend_unavailable():
+    backend = RedisCacheBackend('redis://127.0.0.1:1/0', timeout=0.5)
+    cache = ResultCache(backend, ttl=30)
+
+    with pytest.raises(CacheError):
+        await backend.get('page')
+
+    assert await cache.version('candidates') == -1
+    assert await cache.get('candidates', -1, 'page') is None
+
+@pytest.mark.anyio
+async def test_redis_backend_pool(redis_stand_in):
+    backend = RedisCacheBackend(redis_stand_in, timeout=1.0, pool_size=2)
+    await backend.set('page', b'[]', ttl=30)
+
+    replies = await asyncio.gather(*(backend.get('page') for _ in range(10)))
+
+    assert replies == [b'[]'] * 10
+    assert len(backend._idle) <= 2
+    await backend.close()
+
+@pytest.mark.anyio
+async def test_redis_backend_pool_exhausted(redis_stand_in):
+    backend = RedisCacheBackend(redis_stand_in, timeout=0.1, pool_size=1)
+
+    # Waiting for a connection counts against the timeout
+    async with backend._slots:
+        with pytest.raises(CacheError):
+            await backend.get('page')
+
+    assert await backend.get('page') is None
+    await backend.close()
+
+# Tests for versioned invalidation
+@pytest.mark.anyio
+async def test_result_cache_invalidate():
+    cache = ResultCache(MemoryCacheBackend(maxsize=10), ttl=30)
+    version = await cache.version('candidates')
+    await cache.set('candidates', version, 'page', b'cached')
+
+    await cache.invalidate('candidates')
+
+    assert await cache.get('candidates', version, 'page') == b'cached'
+    assert await cache.get('candidates', await cache.version('candidates'), 'page') is None
+
+@pytest.mark.anyio
+async def test_result_cache_ttl():
+    cache = ResultCache(MemoryCacheBackend(maxsize=10), ttl=0)
+    await cache.set('candidates', 0, 'page', b'cached')
+
+    assert await cache.get('candidates', 0, 'page') is None
+
+
+# Endpoint tests
+
+# Test for cached candidate pages
+@pytest.mark.anyio
+@pytest.mark.parametrize('backend', ['memory', 'redis'])
+async def test_get_candidates_cached(
+    async_client, test_engine, seeded_candidates, redis_stand_in, monkeypatch, backend
+):
+    if backend == 'memory':
+        monkeypatch.setattr(result_cache, 'backend', MemoryCacheBackend(maxsize=10))
+    else:
+        monkeypatch.setattr(result_cache, 'backend', RedisCacheBackend(redis_stand_in, timeout=1.0))
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_engine.sync_engine, 'before_cursor_execute', listener)
+
+    first = await async_client.get('/candidates/', params={'skills': ['Python', 'fastapi']})
+    executed = len(statements)
+    second = await async_client.get('/candidates/', params={'skills': ['fastapi', 'python', 'python']})
+    cached_statements = len(statements) - executed
+    await async_client.post(
+        '/candidates/', json={'full_name': 'Joe Doe', 'email': 'joed@example.com', 'skills': ['python']}
+    )
+    third = await async_client.get('/candidates/', params={'skills': ['python', 'fastapi']})
+    event.remove(test_engine.sync_engine, 'before_cursor_execute', listener)
+
+    assert cached_statements == 0
+    assert second.content == first.content
+    assert len(third.json()) == len(first.json()) + 1
+
+
+# Service tests
+
+# Test for replica reads never filling the cache and pinned reads never being served from it
+@pytest.mark.anyio
+async def test_candidates_page_cache_read_source(async_session, seeded_candidates, monkeypatch):
+    monkeypatch.setattr(result_cache, 'backend', MemoryCacheBackend(maxsize=10))
+
+    async_session.info['replica'] = True
+    await get_candidates_page(async_session, limit=10)
+    assert result_cache.backend.entries.stats()['size'] == 0
+
+    async_session.info['replica'] = False
+    body, _ = await get_candidates_page(async_session, limit=10)
+    assert result_cache.backend.entries.stats()['size'] == 1
+
+    # A stale entry, as left behind when invalidating after a write failed
+    key = next(iter(result_cache.backend.entries._entries))
+    await result_cache.backend.set(key, b'\n[]', ttl=30)
+    async_session.info['pinned_to_primary'] = True
+
+    assert (await get_candidates_page(async_session, limit=10))[0] == body
@@ -1,13 +1,17 @@
+import json
 import pytest
 from datetime import datetime
 from fastapi import HTTPException
+from sqlalchemy import event, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from api.core.streams import DataFormat
 from api.models.candidates import Candidates
 from api.schemas.applications import ApplicationCreateSchema
-from api.schemas.candidates import CandidateDetailedSchema, CandidateUpdateSchema
+from api.schemas.candidates import CandidateDetailedSchema, CandidateUpdateSchema, CountMode, SkillsMatch
 from api.services.candidates import (
-    create_candidate, create_candidate_application, get_applications_by_candidate_id, 
-    get_candidate_by_id, get_candidates_list, update_candidate
+    count_candidates, create_candidate, create_candidate_application, get_applications_by_candidate_id, 
+    get_candidate_by_id, get_candidate_version, get_candidates_list, get_candidates_next_cursor, 
+    import_candidates, search_candidates, update_candidate
 )
 
 
@@ -26,6 +30,167 @@ async def test_create_candidate(async_client):
     
     assert response.status_code == 200
 
+# Test for list candidates with cursor
+@pytest.mark.anyio
+async def test_get_candidates_cursor(async_client, seeded_candidates):
+    first_page = await async_client.get('/candidates/', params={'limit': 1})
+    next_cursor = first_page.headers['X-Next-Cursor']
+
+    second_page = await async_client.get('/candidates/', params={'limit': 1, 'cursor': next_cursor})
+
+    assert first_page.json()[0]['email'] == 'janed@example.com'
+    assert second_page.json()[0]['email'] == 'jayd@example.com'
+
+@pytest.mark.anyio
+async def test_get_candidates_total_count(async_client, seeded_candidates):
+    counted = await async_client.get('/candidates/', params={'count': 'exact', 'skills': 'react'})
+    uncounted = await async_client.get('/candidates/')
+
+    assert counted.headers['X-Total-Count'] == '1'
+    assert 'X-Total-Count' not in uncounted.headers
+
+@pytest.mark.anyio
+async def test_get_candidates_invalid_cursor(async_client, seeded_candidates):
+    response = await async_client.get('/candidates/', params={'cursor': 'not-a-cursor'})
+
+    assert response.status_code == 400
+
+# Tests for embedded applications
+@pytest.mark.anyio
+async def test_get_candidates_include_applications(
+    async_client, test_engine, seeded_candidates, seeded_candidate_application
+):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(test_engine.sync_engine, 'before_cursor_execute', listener)
+    response = await async_client.get('/candidates/', params={'include': 'applications'})
+    event.remove(test_engine.sync_engine, 'before_cursor_execute', listener)
+    plain = await async_client.get('/candidates/')
+    candidates = {candidate['email']: candidate for candidate in response.json()}
+
+    assert response.status_code == 200
+    assert len(statements) == 2
+    assert candidates['janed@example.com']['applications'][0]['job_title'] == 'Sofware Developer'
+    assert candidates['jayd@example.com']['applications'] == []
+    assert all('applications' not in candidate for candidate in plain.json())
+
+@pytest.mark.anyio
+async def test_get_candidate_include_applications(async_client, seeded_candidates, seeded_candidate_application):
+    candidate_url = '/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1'
+    plain = await async_client.get(candidate_url)
+    embedded = await async_client.get(candidate_url, params={'include': 'applications'})
+
+    assert embedded.status_code == 200
+    assert len(embedded.json()['applications']) == 1
+    assert 'applications' not in plain.json()
+    assert embedded.headers['ETag'] != plain.headers['ETag']
+
+# Test for search candidates
+@pytest.mark.anyio
+async def test_get_candidates_search(async_client, seeded_candidates):
+    response = await async_client.get('/candidates/search', params={'q': 'doe', 'limit': 5})
+    results = response.json()
+
+    assert response.status_code == 200
+    assert {result['email'] for result in results} == {'janed@example.com', 'jayd@example.com'}
+    assert all(result['score'] > 0 for result in results)
+
+# Tests for conditional GET
+@pytest.mark.anyio
+async def test_get_candidate_etag(async_client, seeded_candidates):
+    candidate_url = '/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1'
+    response = await async_client.get(candidate_url)
+    etag = response.headers['ETag']
+
+    not_modified = await async_client.get(candidate_url, headers={'If-None-Match': etag})
+    await async_client.put(candidate_url, json={'phone': '111'})
+    modified = await async_client.get(candidate_url, headers={'If-None-Match': etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers['ETag'] == etag
+    assert modified.status_code == 200
+    assert modified.headers['ETag'] != etag
+
+@pytest.mark.anyio
+async def test_get_candidate_applications_etag(async_client, seeded_candidates, seeded_candidate_application):
+    applications_url = '/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1/applications'
+    etag = (await async_client.get(applications_url)).headers['ETag']
+
+    not_modified = await async_client.get(applications_url, headers={'If-None-Match': etag})
+    await async_client.patch('/applications/3fa85f64-5717-4562-b3fc-2c963f66afb1', json={'status': 'hired'})
+    modified = await async_client.get(applications_url, headers={'If-None-Match': etag})
+
+    assert not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert modified.json()[0]['status'] == 'hired'
+
+@pytest.mark.anyio
+async def test_get_candidate_applications_not_found(async_client):
+    response = await async_client.get('/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa5/applications')
+
+    assert response.status_code == 404
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('limit', [-1, 0, 101])
+async def test_get_candidate_applications_limit_out_of_range(async_client, seeded_candidates, limit):
+    response = await async_client.get(
+        '/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1/applications', params={'limit': limit}
+    )
+
+    assert response.status_code == 422
+
+# Test for bulk import candidates
+@pytest.mark.anyio
+async def test_post_candidates_bulk_ndjson(async_client, seeded_candidates):
+    body = '\n'.join([
+        '{"full_name": "New Person", "email": "New@Example.com", "skills": ["Go"]}',
+        '{"full_name": "Jane Doe", "email": "janed@example.com", "phone": "1", "skills": ["Rust"]}',
+        '{"full_name": "No Email", "skills": []}',
+        'not json',
+    ])
+    response = await async_client.post(
+        '/candidates/bulk', content=body, headers={'Content-Type': 'application/x-ndjson'}
+    )
+    result = response.json()
+
+    assert response.status_code == 200
+    assert (result['inserted'], result['updated'], result['failed']) == (1, 1, 2)
+    assert [error['row'] for error in result['errors']] == [3, 4]
+
+@pytest.mark.anyio
+async def test_post_candidates_bulk_nul_character(async_client):
+    body = '\n'.join([
+        '{"full_name": "New Person", "email": "new@example.com", "skills": ["Go"]}',
+        '{"full_name": "Bad\\u0000Name", "email": "bad@example.com", "skills": []}',
+    ])
+    response = await async_client.post(
+        '/candidates/bulk', content=body, headers={'Content-Type': 'application/x-ndjson'}
+    )
+    result = response.json()
+
+    assert response.status_code == 200
+    assert (result['inserted'], result['updated'], result['failed']) == (1, 0, 1)
+    assert result['errors'][0] == {'row': 2, 'detail': 'full_name: NUL characters are not allowed'}
+
+@pytest.mark.anyio
+async def test_post_candidates_bulk_unsupported_type(async_client):
+    response = await async_client.post(
+        '/candidates/bulk', content='<xml/>', headers={'Content-Type': 'application/xml'}
+    )
+
+    assert response.status_code == 415
+
+# Test for export candidates
+@pytest.mark.anyio
+async def test_get_candidates_export_ndjson(async_client, seeded_candidates):
+    response = await async_client.get('/candidates/export')
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    assert [row['email'] for row in rows] == ['janed@example.com', 'jayd@example.com']
+    assert rows[0]['skills'] == ['python', 'fastapi', 'sqlalchemy']
+
 
 # Service tests
 
@@ -46,6 +211,21 @@ async def test_get_candidates_list_filter_skills(async_session: AsyncSession, se
     assert results[0].email == 'jayd@example.com'
 
 
+@pytest.mark.anyio
+async def test_get_candidates_list_filter_skills_match_all(async_session: AsyncSession, seeded_candidates):
+    any_results = await get_candidates_list(async_session, 0, 10, ['Python', 'react'])
+    all_results = await get_candidates_list(
+        async_session, 0, 10, ['Python', 'fastapi'], match=SkillsMatch.ALL
+    )
+    no_results = await get_candidates_list(
+        async_session, 0, 10, ['python', 'react'], match=SkillsMatch.ALL
+    )
+
+    assert len(any_results) == 2
+    assert [c.email for c in all_results] == ['janed@example.com']
+    assert no_results == []
+
+
 @pytest.mark.anyio
 async def test_get_candidates_list_offset_limit(async_session: AsyncSession, seeded_candidates):
     results = await get_candidates_list(async_session, 1, 1, [])
@@ -53,6 +233,58 @@ async def test_get_candidates_list_offset_limit(async_session: AsyncSession, see
     assert len(results) == 1
     assert results[0].email == 'jayd@example.com'
 
+
+@pytest.mark.anyio
+async def test_get_candidates_list_cursor(async_session: AsyncSession, seeded_candidates):
+    first_page = await get_candidates_list(async_session, 0, 1, [])
+    cursor = get_candidates_next_cursor(first_page, 1)
+
+    second_page = await get_candidates_list(async_session, 0, 1, [], cursor)
+    last_page = await get_candidates_list(
+        async_session, 0, 1, [], get_candidates_next_cursor(second_page, 1)
+    )
+
+    assert second_page[0].email == 'jayd@example.com'
+    assert last_page == []
+    assert get_candidates_next_cursor(last_page, 1) is None
+
+# Tests for count_candidates()
+@pytest.mark.anyio
+async def test_count_candidates(async_session: AsyncSession, seeded_candidates):
+    assert await count_candidates(async_session) == 2
+    assert await count_candidates(async_session, ['python', 'react']) == 2
+    assert await count_candidates(async_session, ['python', 'react'], SkillsMatch.ALL) == 0
+    assert await count_candidates(async_session, mode=CountMode.NONE) is None
+
+@pytest.mark.anyio
+async def test_count_candidates_estimated(async_session: AsyncSession, seeded_candidates):
+    await async_session.execute(text('ANALYZE candidates'))
+
+    assert await count_candidates(async_session, mode=CountMode.ESTIMATED) == 2
+    assert await count_candidates(async_session, ['react'], mode=CountMode.ESTIMATED) >= 0
+    # Skills are bound, not spliced into the EXPLAIN text, so colons and quotes are just data
+    assert await count_candidates(async_session, ["c# :net", "o'reilly"], mode=CountMode.ESTIMATED) >= 0
+
+@pytest.mark.anyio
+async def test_get_candidates_estimated_count_with_colon(async_client, seeded_candidates):
+    response = await async_client.get('/candidates/', params={'skills': 'c# :net', 'count': 'estimated'})
+
+    assert response.status_code == 200
+    assert int(response.headers['x-total-count']) >= 0
+
+# Tests for search_candidates()
+@pytest.mark.anyio
+async def test_search_candidates(async_session: AsyncSession, seeded_candidates, seeded_candidate_application):
+    by_name = await search_candidates(async_session, 'JANE')
+    by_email = await search_candidates(async_session, 'jayd@')
+    by_job_title = await search_candidates(async_session, 'developers')
+
+    assert by_name[0][0].email == 'janed@example.com'
+    assert by_name[0][1] > 0
+    assert by_email[0][0].email == 'jayd@example.com'
+    assert [candidate.email for candidate, _ in by_job_title] == ['janed@example.com']
+    assert await search_candidates(async_session, 'zzzzqqq') == []
+
 # Tests for get_candidate_by_id()
 @pytest.mark.anyio
 async def test_get_candidate_by_id(async_session: AsyncSession, seeded_candidates):
@@ -107,6 +339,23 @@ async def test_update_candidate(async_session: AsyncSession, seeded_candidates):
     assert updated_candidate.phone == '790988800'
     assert sorted(updated_candidate.skills) == ['javascript', 'react', 'ruby']
 
+@pytest.mark.anyio
+async def test_update_candidate_not_found(async_session: AsyncSession, seeded_candidates):
+    payload = CandidateUpdateSchema(full_name='Nobody')
+
+    with pytest.raises(HTTPException) as exc_info:
+        await update_candidate(async_session, '3fa85f64-5717-4562-b3fc-2c963f66afa5', payload)
+
+    assert exc_info.value.status_code == 404
+
+@pytest.mark.anyio
+async def test_update_candidate_empty_payload(async_session: AsyncSession, seeded_candidates):
+    updated_candidate = await update_candidate(
+        async_session, '3fa85f64-5717-4562-b3fc-2c963f66afa2', CandidateUpdateSchema()
+    )
+
+    assert updated_candidate.email == 'jayd@example.com'
+
 # Tests for get_applications_by_candidate_id()
 @pytest.mark.anyio
 async def test_get_applications_by_candidate_id(
@@ -155,6 +404,7 @@ async def test_create_candidate_application(async_session: AsyncSession, seeded_
     assert new_application.job_title == 'web developer'
     assert new_application.status == 'applied'
     assert new_application.applied_at == datetime.fromisoformat('2025-07-01T17:57:03.364')
+    assert await get_candidate_version(async_session, '3fa85f64-5717-4562-b3fc-2c963f66afa1') == 2
 
 @pytest.mark.anyio
 async def test_create_candidate_application_candidate_not_found(
@@ -174,4 +424,56 @@ async def test_create_candidate_application_candidate_not_found(
             application
         )
 
-    assert exc_info.value.status_code == 404
\ No newline at end of file
+    assert exc_info.value.status_code == 404
+
+# Tests for import_candidates()
+@pytest.mark.anyio
+async def test_import_candidates_csv(async_session: AsyncSession, seeded_candidates):
+    async def chunks():
+        yield b'full_name,email,phone,skills\r\nAnn Lee,ANN@example.com,,Python; SQL\r\n'
+        yield b'"Doe, Jay",jayd@example.com,555,"Vue"\r\nBad,not-an-email,,\r\n'
+
+    result = await import_candidates(async_session, chunks(), DataFormat.CSV)
+    candidates = (await async_session.execute(
+        select(Candidates).where(Candidates.email.in_(['ann@example.com', 'jayd@example.com']))
+        .order_by(Candidates.email).execution_options(populate_existing=True)
+    )).scalars().all()
+
+    assert (result.inserted, result.updated, result.failed) == (1, 1, 1)
+    assert result.errors[0].row == 3
+    assert candidates[0].full_name == 'ann lee'
+    assert candidates[0].phone is None
+    assert candidates[0].skills == ['python', 'sql']
+    assert candidates[1].full_name == 'doe, jay'
+    assert candidates[1].skills == ['vue']
+
+@pytest.mark.anyio
+async def test_import_candidates_rejected_rows(async_session: AsyncSession, seeded_candidates):
+    await async_session.execute(text(
+        "ALTER TABLE candidates ADD CONSTRAINT no_rejects CHECK (full_name NOT LIKE 'reject%')"
+    ))
+    await async_session.commit()
+
+    async def chunks():
+        yield b'full_name,email,phone,skills\r\nAnn Lee,ann@example.com,,\r\nReject Me,rm@example.com,,\r\n'
+        yield b'Bob Ray,bob@example.com,,\r\nReject Too,jayd@example.com,,\r\n'
+
+    result = await import_candidates(async_session, chunks(), DataFormat.CSV)
+    emails = set(await async_session.scalars(select(Candidates.email)))
+
+    assert (result.inserted, result.updated, result.failed) == (2, 0, 2)
+    assert sorted(error.row for error in result.errors) == [2, 4]
+    assert {'ann@example.com', 'bob@example.com'} <= emails
+    assert 'rm@example.com' not in emails
+
+@pytest.mark.anyio
+async def test_import_candidates_duplicate_email(async_session: AsyncSession):
+    async def chunks():
+        yield b'full_name,email,phone,skills\r\nAnn Lee,ann@example.com,,\r\nAnn Leigh,ANN@example.com,,\r\n'
+
+    result = await import_candidates(async_session, chunks(), DataFormat.CSV)
+    candidate = await async_session.scalar(select(Candidates).where(Candidates.email == 'ann@example.com'))
+
+    assert (result.inserted, result.updated, result.failed) == (1, 0, 1)
+    assert result.errors[0].row == 1
+    assert candidate.full_name == 'ann leigh'
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.core.changes import CHANGES_CHANNEL, ChangeListener
+from api.models.candidates import Candidates
+from api.schemas.candidates import CandidateUpdateSchema
+from api.services.candidates import update_candidate
+from api.services.changes import stream_changes
+
+
+# Endpoint tests
+
+# Test for the first page of the feed and following its cursor
+@pytest.mark.anyio
+async def test_get_changes(async_client, seeded_candidates, seeded_candidate_application):
+    response = await async_client.get('/changes', params={'limit': 2})
+    page = response.json()
+
+    assert response.status_code == 200
+    assert [change['type'] for change in page['changes']] == ['candidate', 'candidate']
+    assert page['changes'][0]['candidate']['email'] == 'janed@example.com'
+
+    page = (await async_client.get('/changes', params={'since': page['cursor']})).json()
+
+    assert [change['type'] for change in page['changes']] == ['application']
+    assert page['changes'][0]['application']['job_title'] == 'Sofware Developer'
+
+    cursor = page['cursor']
+    page = (await async_client.get('/changes', params={'since': cursor})).json()
+
+    assert page == {'changes': [], 'cursor': cursor}
+
+# Test for an updated row coming back after the cursor with a new updated_at
+@pytest.mark.anyio
+async def test_get_changes_after_update(async_client, seeded_candidates):
+    page = (await async_client.get('/changes')).json()
+    created = {change['id']: change['updated_at'] for change in page['changes']}
+
+    await async_client.put('/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa2', json={'phone': '5'})
+    changes = (await async_client.get('/changes', params={'since': page['cursor']})).json()['changes']
+
+    assert [change['id'] for change in changes] == ['3fa85f64-5717-4562-b3fc-2c963f66afa2']
+    assert changes[0]['candidate']['phone'] == '5'
+    assert changes[0]['updated_at'] > created['3fa85f64-5717-4562-b3fc-2c963f66afa2']
+
+# Test for writes through CTEs stamping both tables
+@pytest.mark.anyio
+async def test_get_changes_after_application_create(async_client, seeded_candidates):
+    cursor = (await async_client.get('/changes')).json()['cursor']
+
+    await async_client.post(
+        '/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa1/applications',
+        json={'job_title': 'Data Engineer', 'status': 'applied', 'applied_at': '2025-07-01T08:52:45.171'}
+    )
+    changes = (await async_client.get('/changes', params={'since': cursor})).json()['changes']
+
+    assert [change['type'] for change in changes] == ['candidate', 'application']
+
+# Test for rows held back while an older transaction is still running
+@pytest.mark.anyio
+async def test_get_changes_waits_for_running_transactions(async_client, seeded_candidates, test_engine):
+    cursor = (await async_client.get('/changes')).json()['cursor']
+
+    async with test_engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.execute(
+            update(Candidates).where(Candidates.email == 'janed@example.com').values(phone='7')
+        )
+        # Commits after the one above started, so its xid is larger
+        await async_client.put('/candidates/3fa85f64-5717-4562-b3fc-2c963f66afa2', json={'phone': '5'})
+
+        assert (await async_client.get('/changes', params={'since': cursor})).json()['changes'] == []
+
+        await transaction.commit()
+
+    changes = (await async_client.get('/changes', params={'since': cursor})).json()['changes']
+
+    assert [change['candidate']['phone'] for change in changes] == ['7', '5']
+
+# Test for malformed cursors
+@pytest.mark.anyio
+async def test_get_changes_invalid_cursor(async_client):
+    response = await async_client.get('/changes', params={'since': 'not-a-cursor'})
+
+    assert response.status_code == 400
+
+
+# Service tests
+
+# Test for the event stream waking on NOTIFY rather than waiting for its poll
+@pytest.mark.anyio
+async def test_stream_changes(async_session, seeded_candidates, test_engine):
+    listener = ChangeListener(test_engine.url, CHANGES_CHANNEL)
+    session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    stream = stream_changes(session_factory, None, 10, listener, poll_interval=30)
+
+    try:
+        first = await asyncio.wait_for(anext(stream), 5)
+        second = await asyncio.wait_for(anext(stream), 5)
+
+        assert first.startswith('id: ') and '\nevent: candidate\n' in first
+        assert 'jayd@example.com' in second
+
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.1)
+        await update_candidate(
+            async_session, '3fa85f64-5717-4562-b3fc-2c963f66afa1', CandidateUpdateSchema(phone='9')
+        )
+        event = await asyncio.wait_for(pending, 5)
+
+        assert '"phone":"9"' in event
+    finally:
+        await stream.aclose()
+        await listener.close()
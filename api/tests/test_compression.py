@@ -0,0 +1,145 @@
+import asyncio
+import gzip
+import zlib
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from api.core.compression import CompressionMiddleware, negotiate_encoding
+
+
+LARGE_BODY = 'candidate,python,fastapi\n' * 200
+
+
+async def large(request):
+    return PlainTextResponse(LARGE_BODY, headers={'ETag': '"v1"'})
+
+async def small(request):
+    return PlainTextResponse('ok')
+
+async def image(request):
+    return Response(b'\x89PNG' * 1000, media_type='image/png')
+
+async def events(request):
+    return StreamingResponse(iter(['data: 1\n\n', 'data: 2\n\n']), media_type='text/event-stream')
+
+async def export(request):
+    return StreamingResponse(iter([LARGE_BODY, LARGE_BODY]), media_type='text/csv')
+
+
+compression_app = CompressionMiddleware(
+    Starlette(routes=[
+        Route('/large', large), Route('/small', small), Route('/image', image),
+        Route('/events', events), Route('/export', export)
+    ]),
+    minimum_size=1024
+)
+
+
+@pytest.fixture
+async def compression_client():
+    async with AsyncClient(transport=ASGITransport(app=compression_app), base_url='http://test') as client:
+        yield client
+
+
+# Unit tests
+
+# Test for Accept-Encoding negotiation
+@pytest.mark.anyio
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0.5, gzip;q=0.8', 'gzip'),
+    ('*', 'br'),
+    ('gzip;q=0, *;q=0', None),
+    ('identity', None),
+    ('', None),
+])
+async def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+# Middleware tests
+
+# Test for gzip on a body above the threshold
+@pytest.mark.anyio
+async def test_gzip_large_body(compression_client):
+    response = await compression_client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.headers['etag'] == 'W/"v1"'
+    assert int(response.headers['content-length']) < len(LARGE_BODY)
+    assert response.text == LARGE_BODY
+
+# Test for brotli when the client prefers it
+@pytest.mark.anyio
+async def test_brotli_large_body(compression_client):
+    response = await compression_client.get('/large', headers={'Accept-Encoding': 'br'})
+
+    assert response.headers['content-encoding'] == 'br'
+    assert response.text == LARGE_BODY
+
+# Test for bodies left alone below the threshold, for binary types and without negotiation
+@pytest.mark.anyio
+@pytest.mark.parametrize('url, accept_encoding', [
+    ('/small', 'gzip'),
+    ('/image', 'gzip'),
+    ('/large', 'identity'),
+])
+async def test_uncompressed(compression_client, url, accept_encoding):
+    response = await compression_client.get(url, headers={'Accept-Encoding': accept_encoding})
+
+    assert 'content-encoding' not in response.headers
+    assert not response.headers.get('etag', '').startswith('W/')
+
+# Test for server-sent events never being compressed
+@pytest.mark.anyio
+async def test_event_stream_uncompressed(compression_client):
+    response = await compression_client.get('/events', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'content-encoding' not in response.headers
+    assert response.text == 'data: 1\n\ndata: 2\n\n'
+
+# Test for streamed exports being compressed chunk by chunk
+@pytest.mark.anyio
+async def test_streaming_export():
+    messages = []
+
+    async def receive():
+        # The client never disconnects, so the response is free to stream to the end
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': '/export', 'raw_path': b'/export', 'root_path': '',
+        'query_string': b'', 'headers': [(b'accept-encoding', b'gzip')], 'scheme': 'http', 'http_version': '1.1',
+    }
+    await compression_app(scope, receive, send)
+
+    headers = dict(messages[0]['headers'])
+    chunks = [message['body'] for message in messages[1:]]
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+    assert headers[b'content-encoding'] == b'gzip'
+    assert b'content-length' not in headers
+    # Every chunk is flushed, so the client can decode it as soon as it arrives
+    assert decompressor.decompress(chunks[0]).decode() == LARGE_BODY
+    assert gzip.decompress(b''.join(chunks)).decode() == LARGE_BODY * 2
+
+
+# Endpoint tests
+
+# Test for small candidate pages passing through the application middleware stack uncompressed
+@pytest.mark.anyio
+async def test_get_candidates_below_threshold(async_client, seeded_candidates):
+    response = await async_client.get('/candidates/', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.status_code == 200
+    assert 'content-encoding' not in response.headers
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert len(response.json()) == 2
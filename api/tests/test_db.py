@@ -0,0 +1,62 @@
+import time
+import pytest
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.core import db as core_db
+from api.core.db import READ_YOUR_WRITES_COOKIE, ReplicaMonitor, SessionLocal, get_read_session_factory
+
+
+def build_request(cookie: str | None = None) -> Request:
+    headers = [(b'cookie', f'{READ_YOUR_WRITES_COOKIE}={cookie}'.encode())] if cookie else []
+
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': headers})
+
+
+@pytest.fixture
+def replica(monkeypatch, test_engine):
+    replica_session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    monitor = ReplicaMonitor(test_engine, max_lag=1.0, check_interval=60.0)
+
+    monkeypatch.setattr(core_db, 'replica_engine', test_engine)
+    monkeypatch.setattr(core_db, 'ReplicaSessionLocal', replica_session_factory)
+    monkeypatch.setattr(core_db, 'replica_monitor', monitor)
+
+    return replica_session_factory, monitor
+
+
+# Tests for get_read_session_factory()
+@pytest.mark.anyio
+async def test_read_session_factory_without_replica():
+    assert await get_read_session_factory(build_request()) is SessionLocal
+
+@pytest.mark.anyio
+async def test_read_session_factory_uses_fresh_replica(replica):
+    replica_session_factory, monitor = replica
+
+    assert await get_read_session_factory(build_request()) is replica_session_factory
+    assert monitor.lag == 0
+
+@pytest.mark.anyio
+async def test_read_session_factory_falls_back_on_lag(replica):
+    _, monitor = replica
+    monitor.max_lag = -1
+
+    assert await get_read_session_factory(build_request()) is SessionLocal
+
+@pytest.mark.anyio
+async def test_read_session_factory_read_your_writes(replica):
+    pinned_request = build_request(f'{time.time() + 5:.3f}')
+    expired_request = build_request(f'{time.time() - 5:.3f}')
+
+    assert await get_read_session_factory(pinned_request) is SessionLocal
+    assert await get_read_session_factory(expired_request) is replica[0]
+
+@pytest.mark.anyio
+async def test_commit_pins_reads_to_primary(replica, test_engine):
+    response = Response()
+
+    async with async_sessionmaker(bind=test_engine)(info={'response': response}) as session:
+        await session.commit()
+
+    assert READ_YOUR_WRITES_COOKIE in response.headers['set-cookie']
@@ -0,0 +1,17 @@
+import pytest
+
+from api.core.config import database_settings
+
+
+# Endpoint tests
+
+# Test for pool statistics
+@pytest.mark.anyio
+async def test_get_pool(async_client):
+    response = await async_client.get('/internal/pool')
+    stats = response.json()
+
+    assert response.status_code == 200
+    assert stats['size'] == database_settings.pool_size
+    assert stats['checked_out'] == 0
+    assert set(stats) >= {'overflow', 'checkouts', 'total_wait_seconds', 'max_wait_seconds'}
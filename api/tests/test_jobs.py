@@ -0,0 +1,249 @@
+import asyncio
+from datetime import timedelta
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.core.config import job_settings
+from api.core.jobs import JobContext, JobRunner, job_handler
+from api.models.applications import Applications
+from api.models.candidates import Candidates
+from api.models.jobs import JobInputChunks, JobStatus, Jobs
+from api.services import jobs as jobs_service
+from api.services.candidates import CANDIDATE_IMPORT_JOB
+from api.services.jobs import submit_job
+
+
+IMPORT_BODY = '\n'.join([
+    '{"full_name": "New Person", "email": "new@example.com", "skills": ["Go"]}',
+    '{"full_name": "Jane Doe", "email": "janed@example.com", "phone": "1", "skills": ["Rust"]}',
+    'not json',
+])
+
+
+async def chunks(body: bytes, chunk_size: int = 16):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+@job_handler('test_slow')
+async def run_slow_job(job: JobContext) -> dict:
+    for step in range(100):
+        await job.report(step)
+        await asyncio.sleep(0.01)
+
+    return {'steps': 100}
+
+@job_handler('test_broken')
+async def run_broken_job(job: JobContext) -> dict:
+    raise RuntimeError('boom')
+
+
+@pytest.fixture
+def test_runner(test_engine):
+    return JobRunner(
+        async_sessionmaker(bind=test_engine, expire_on_commit=False),
+        workers=1, poll_interval=0.01, heartbeat_interval=0.05, stale_after=60, max_attempts=2
+    )
+
+
+# Endpoint tests
+
+# Test for a candidate import submitted as a job and polled to completion
+@pytest.mark.anyio
+async def test_candidate_import_job(async_client, async_session, seeded_candidates, test_runner, monkeypatch):
+    # Stored in several chunks, as a large upload would be
+    monkeypatch.setattr(jobs_service, 'JOB_INPUT_CHUNK_SIZE', 32)
+    response = await async_client.post(
+        '/jobs/candidate-import', content=IMPORT_BODY, headers={'Content-Type': 'application/x-ndjson'}
+    )
+    job = response.json()
+
+    assert response.status_code == 202
+    assert response.headers['location'] == f"/jobs/{job['id']}"
+    assert job['status'] == 'queued'
+    assert await async_session.scalar(select(func.count()).select_from(JobInputChunks)) > 1
+
+    assert await test_runner.run_pending() == 1
+
+    job = (await async_client.get(f"/jobs/{job['id']}")).json()
+
+    assert job['status'] == 'succeeded'
+    assert job['progress'] == 3
+    assert (job['result']['inserted'], job['result']['updated'], job['result']['failed']) == (1, 1, 1)
+    # The input of a finished job is deleted
+    assert await async_session.scalar(select(func.count()).select_from(JobInputChunks)) == 0
+
+# Test for imports over the size limit
+@pytest.mark.anyio
+async def test_candidate_import_job_too_large(async_client, async_session, monkeypatch):
+    monkeypatch.setattr(job_settings, 'max_input_size', 64)
+
+    async def body():
+        yield IMPORT_BODY.encode()
+
+    # Without a Content-Length the limit is enforced while the body is stored
+    response = await async_client.post(
+        '/jobs/candidate-import', content=body(), headers={'Content-Type': 'application/x-ndjson'}
+    )
+
+    assert response.status_code == 413
+    assert await async_session.scalar(select(func.count()).select_from(Jobs)) == 0
+    # With one, the upload is refused before it is read
+    response = await async_client.post(
+        '/jobs/candidate-import', content=IMPORT_BODY, headers={'Content-Type': 'application/x-ndjson'}
+    )
+    assert response.status_code == 413
+
+# Test for a bulk status change submitted as a job
+@pytest.mark.anyio
+async def test_application_status_job(
+    async_client, async_session, seeded_candidates, seeded_candidate_application, test_runner
+):
+    response = await async_client.post(
+        '/jobs/application-status', json={'current_status': 'applied', 'status': 'rejected'}
+    )
+
+    assert response.status_code == 202
+
+    await test_runner.run_pending()
+    job = (await async_client.get(f"/jobs/{response.json()['id']}")).json()
+    application = await async_session.scalar(
+        select(Applications).where(Applications.id == seeded_candidate_application.id)
+        .execution_options(populate_existing=True)
+    )
+
+    assert (job['status'], job['total'], job['progress'], job['result']) == ('succeeded', 1, 1, {'updated': 1})
+    assert application.status == 'rejected'
+
+# Test for cancelling a queued job and for cancelling one that has finished
+@pytest.mark.anyio
+async def test_cancel_queued_job(async_client, test_runner):
+    response = await async_client.post(
+        '/jobs/application-status', json={'current_status': 'applied', 'status': 'rejected'}
+    )
+    job_id = response.json()['id']
+
+    response = await async_client.post(f'/jobs/{job_id}/cancel')
+
+    assert response.status_code == 200
+    assert response.json()['status'] == 'cancelled'
+    assert await test_runner.run_pending() == 0
+    assert (await async_client.post(f'/jobs/{job_id}/cancel')).status_code == 409
+
+# Test for unknown jobs
+@pytest.mark.anyio
+async def test_get_job_not_found(async_client):
+    response = await async_client.get('/jobs/3fa85f64-5717-4562-b3fc-2c963f66afa9')
+
+    assert response.status_code == 404
+
+
+# Runner tests
+
+# Test for a running job stopping at its next progress report once cancelled
+@pytest.mark.anyio
+async def test_cancel_running_job(async_session, test_runner):
+    job = await submit_job(async_session, 'test_slow', {})
+    test_runner.start()
+
+    try:
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            progress = await async_session.scalar(
+                select(Jobs.progress).where(Jobs.id == job.id).execution_options(populate_existing=True)
+            )
+            if progress:
+                break
+        await async_session.execute(update(Jobs).where(Jobs.id == job.id).values(cancel_requested=True))
+        await async_session.commit()
+
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            await async_session.refresh(job)
+            if job.status != JobStatus.RUNNING:
+                break
+    finally:
+        await test_runner.stop()
+
+    assert job.status == JobStatus.CANCELLED
+    assert 0 < job.progress < 100
+
+# Test for a failing handler recording its error
+@pytest.mark.anyio
+async def test_failed_job(async_session, test_runner):
+    job = await submit_job(async_session, 'test_broken', {})
+
+    await test_runner.run_pending()
+    await async_session.refresh(job)
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == 'boom'
+
+# Test for a job orphaned by a dead process resuming from its checkpoint
+@pytest.mark.anyio
+async def test_resume_stale_job(async_session, test_runner, seeded_candidates):
+    job = await submit_job(async_session, CANDIDATE_IMPORT_JOB, {'format': 'ndjson'}, chunks(IMPORT_BODY.encode()))
+    # As left behind by a process that died after committing the first row
+    job.status = JobStatus.RUNNING
+    job.attempts = 1
+    job.checkpoint = {'row': 1, 'result': {'inserted': 1, 'updated': 0, 'failed': 0, 'errors': []}}
+    await async_session.commit()
+    await async_session.execute(
+        update(Jobs).where(Jobs.id == job.id).values(heartbeat_at=Jobs.created_at - timedelta(hours=1))
+    )
+    await async_session.commit()
+
+    assert await test_runner.run_pending() == 1
+    await async_session.refresh(job)
+    emails = set(await async_session.scalars(select(Candidates.email)))
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.attempts == 2
+    assert (job.result['inserted'], job.result['updated'], job.result['failed']) == (1, 1, 1)
+    # The first row was skipped on resume, as the checkpoint says it was already imported
+    assert 'new@example.com' not in emails
+
+# Test for a runner that lost its job to another one leaving the job alone
+@pytest.mark.anyio
+async def test_lost_job_fenced(async_session, test_runner):
+    job = await submit_job(async_session, 'test_slow', {})
+    claimed = await test_runner.claim()
+    # Claimed again by another runner after this one's heartbeats went stale
+    await async_session.execute(update(Jobs).where(Jobs.id == job.id).values(attempts=Jobs.attempts + 1))
+    await async_session.commit()
+
+    await test_runner.run(claimed)
+    await async_session.refresh(job)
+
+    assert (job.status, job.progress, job.attempts) == (JobStatus.RUNNING, 0, 2)
+
+# Test for a job that keeps crashing its worker being given up on
+@pytest.mark.anyio
+async def test_job_max_attempts(async_session, test_runner):
+    job = await submit_job(async_session, 'test_slow', {})
+    job.attempts = 2
+    await async_session.commit()
+
+    await test_runner.run_pending()
+    await async_session.refresh(job)
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == 'Gave up after 2 attempts.'
+
+# Test for jobs interrupted by a clean shutdown going back to the queue
+@pytest.mark.anyio
+async def test_stop_requeues_running_job(async_session, test_runner):
+    job = await submit_job(async_session, 'test_slow', {})
+    test_runner.start()
+
+    for _ in range(200):
+        await asyncio.sleep(0.01)
+        await async_session.refresh(job)
+        if job.progress:
+            break
+    await test_runner.stop()
+    await async_session.refresh(job)
+
+    assert job.status == JobStatus.QUEUED
+    assert job.attempts == 0
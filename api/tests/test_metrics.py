@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from api.core.metrics import Histogram, instrument_engine, request_db_stats, RequestDbStats
+
+
+# Unit tests
+
+# Test for histogram rendering in the Prometheus text format
+@pytest.mark.anyio
+async def test_histogram_render():
+    histogram = Histogram('latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+    histogram.observe('/a', value=0.05)
+    histogram.observe('/a', value=0.5)
+    histogram.observe('/a', value=5)
+
+    lines = list(histogram.render())
+
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+# Test for per-request database statement attribution
+@pytest.mark.anyio
+async def test_request_db_stats(test_engine, async_session):
+    instrument_engine(test_engine)
+    stats = RequestDbStats()
+    token = request_db_stats.set(stats)
+
+    try:
+        async with test_engine.connect() as connection:
+            await connection.exec_driver_sql('SELECT 1')
+            await connection.exec_driver_sql('SELECT 2')
+    finally:
+        request_db_stats.reset(token)
+
+    assert stats.queries == 2
+    assert stats.seconds > 0
+
+# Test for failed statements leaving no timing state on pooled connections
+@pytest.mark.anyio
+async def test_request_db_stats_failed_statement(test_engine):
+    instrument_engine(test_engine)
+    stats = RequestDbStats()
+    token = request_db_stats.set(stats)
+
+    try:
+        async with test_engine.connect() as connection:
+            with pytest.raises(DBAPIError):
+                await connection.exec_driver_sql('SELECT 1/0')
+            await connection.rollback()
+            await connection.exec_driver_sql('SELECT 1')
+
+            assert 'query_started_at' not in connection.sync_connection.info
+    finally:
+        request_db_stats.reset(token)
+
+    assert stats.queries == 1
+
+
+# Endpoint tests
+
+# Test for the metrics endpoint
+@pytest.mark.anyio
+async def test_get_metrics(async_client, seeded_candidates):
+    await async_client.get('/candidates/')
+    response = await async_client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'http_requests_total{method="GET",route="/candidates/",status="200"}' in response.text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/candidates/",le="+Inf"}' in response.text
+    assert 'db_queries_per_request_count{method="GET",route="/candidates/"}' in response.text
+    assert 'db_pool_connections{database="primary",stat="size"}' in response.text
+    assert 'token_cache{stat="hits"}' in response.text
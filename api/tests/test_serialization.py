@@ -0,0 +1,42 @@
+import json
+import uuid
+from datetime import datetime
+import pytest
+
+from pydantic import TypeAdapter
+
+from api.core.serialization import RowSerializer
+from api.models.applications import ApplicationStatus, Applications
+from api.models.candidates import Candidates
+from api.schemas.applications import ApplicationSchema
+from api.schemas.candidates import CandidateSchema
+
+
+# Unit tests
+
+# Test for the orjson fast path matching the Pydantic output
+@pytest.mark.anyio
+async def test_row_serializer_matches_pydantic():
+    candidates = [
+        Candidates(
+            id=uuid.uuid4(), full_name='jane doe', email='janed@example.com', phone=None,
+            skills=['python', 'sql'], created_at=datetime(2025, 7, 1, 17, 57, 3, 364000)
+        ),
+        Candidates(
+            id=uuid.uuid4(), full_name='jay doe', email='jayd@example.com', phone='0987654321',
+            skills=[], created_at=datetime(2025, 7, 2, 9, 0)
+        ),
+    ]
+    adapter = TypeAdapter(list[CandidateSchema])
+    expected = adapter.dump_python(adapter.validate_python(candidates, from_attributes=True), mode='json')
+
+    assert json.loads(RowSerializer(CandidateSchema).dump_json(candidates)) == expected
+
+@pytest.mark.anyio
+async def test_row_serializer_enum_values():
+    application = Applications(
+        id=uuid.uuid4(), candidate_id=uuid.uuid4(), job_title='designer', status=ApplicationStatus.HIRED,
+        applied_at=datetime(2025, 7, 1, 9, 0)
+    )
+
+    assert json.loads(RowSerializer(ApplicationSchema).dump_json([application]))[0]['status'] == 'hired'
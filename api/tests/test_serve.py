@@ -0,0 +1,38 @@
+import pytest
+import serve
+from serve import available_cpus, cgroup_cpu_limit
+
+
+# Unit tests
+
+# Tests for worker count detection
+@pytest.mark.anyio
+async def test_cgroup_cpu_limit(tmp_path):
+    limited = tmp_path / 'limited'
+    limited.write_text('150000 100000\n')
+    unlimited = tmp_path / 'unlimited'
+    unlimited.write_text('max 100000\n')
+
+    assert cgroup_cpu_limit(str(limited)) == 1.5
+    assert cgroup_cpu_limit(str(unlimited)) is None
+    assert cgroup_cpu_limit(str(tmp_path / 'missing')) is None
+
+@pytest.mark.anyio
+async def test_available_cpus():
+    assert available_cpus() >= 1
+
+# Test for refusing a per-process cache shared by several workers
+@pytest.mark.anyio
+async def test_serve_memory_cache_single_worker(monkeypatch):
+    started = []
+    monkeypatch.setattr(serve.server_settings, 'workers', 2)
+    monkeypatch.setattr(serve.cache_settings, 'backend', 'memory')
+    monkeypatch.setattr(serve.uvicorn, 'run', lambda *args, **kwargs: started.append(kwargs))
+
+    with pytest.raises(SystemExit, match='single worker'):
+        serve.serve()
+
+    monkeypatch.setattr(serve.server_settings, 'workers', 1)
+    serve.serve()
+
+    assert started[0]['workers'] == 1
@@ -0,0 +1,105 @@
+import time
+import pytest
+from datetime import timedelta
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.cache import LRUCache
+from api.models.users import Users
+from api.schemas.users import UserLoginSchema
+from api.services.users import (
+    authenticate_user, create_access_token, pwd_context, token_cache, verify_access_token
+)
+
+
+@pytest.fixture
+async def seeded_user(async_session):
+    user = Users(
+        id='3fa85f64-5717-4562-b3fc-2c963f66afc1',
+        email='admin@example.com',
+        password=pwd_context.handler('bcrypt').using(rounds=4).hash('admin')
+    )
+    async_session.add(user)
+    await async_session.commit()
+
+    return user
+
+
+# Service tests
+
+# Tests for authenticate_user()
+@pytest.mark.anyio
+async def test_authenticate_user(async_session: AsyncSession, seeded_user):
+    result = await authenticate_user(
+        async_session, UserLoginSchema(email='admin@example.com', password='admin')
+    )
+
+    assert result.email == 'admin@example.com'
+
+@pytest.mark.anyio
+async def test_authenticate_user_wrong_password(async_session: AsyncSession, seeded_user):
+    result = await authenticate_user(
+        async_session, UserLoginSchema(email='admin@example.com', password='wrong')
+    )
+
+    assert result is False
+
+@pytest.mark.anyio
+async def test_authenticate_user_unknown_email(async_session: AsyncSession, seeded_user):
+    result = await authenticate_user(
+        async_session, UserLoginSchema(email='nobody@example.com', password='admin')
+    )
+
+    assert result is False
+
+@pytest.mark.anyio
+async def test_authenticate_user_rehashes_outdated_hash(
+    async_session: AsyncSession, seeded_user, monkeypatch
+):
+    monkeypatch.setattr(
+        'api.services.users.pwd_context', 
+        CryptContext(schemes=['bcrypt'], deprecated='auto', bcrypt__min_rounds=5)
+    )
+
+    result = await authenticate_user(
+        async_session, UserLoginSchema(email='admin@example.com', password='admin')
+    )
+
+    assert result.password.startswith('$2b$12$')
+    assert pwd_context.verify('admin', result.password)
+
+# Tests for verify_access_token()
+@pytest.mark.anyio
+async def test_verify_access_token_cached():
+    token_cache.clear()
+    token = create_access_token({'sub': 'admin@example.com'}, timedelta(minutes=5))
+
+    first = verify_access_token(token)
+    second = verify_access_token(token)
+
+    assert first.email == second.email == 'admin@example.com'
+    assert (token_cache.hits, token_cache.misses) == (1, 1)
+
+@pytest.mark.anyio
+async def test_verify_access_token_expired_not_cached():
+    token_cache.clear()
+    token = create_access_token({'sub': 'admin@example.com'}, timedelta(minutes=-1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        verify_access_token(token)
+
+    assert exc_info.value.status_code == 401
+    assert token_cache.stats()['size'] == 0
+
+@pytest.mark.anyio
+async def test_lru_cache_expiry_and_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set('a', 1, time.time() + 60)
+    cache.set('b', 2, time.time() + 60)
+    cache.get('a')
+    cache.set('c', 3, time.time() - 1)
+
+    assert cache.get('b') is None
+    assert cache.get('c') is None
+    assert cache.get('a') == 1
@@ -0,0 +1,80 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+from api.services import warmup
+from api.services.warmup import warm_up, warm_up_engine
+from main import app, lifespan
+
+
+# Service tests
+
+# Test for warm_up_engine()
+@pytest.mark.anyio
+async def test_warm_up_engine(test_engine):
+    await warm_up_engine(test_engine, 3)
+
+    assert test_engine.sync_engine.pool.checkedin() == 3
+
+# Test for warm_up() retrying errors that are not database errors, such as connect timeouts
+@pytest.mark.anyio
+async def test_warm_up_retries(monkeypatch, caplog):
+    attempts = []
+
+    async def flaky_warm_up_engine(database_engine, connections):
+        attempts.append(connections)
+        if len(attempts) == 1:
+            raise asyncio.TimeoutError()
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(warmup, 'warm_up_engine', flaky_warm_up_engine)
+    monkeypatch.setattr(warmup, 'replica_engine', None)
+    monkeypatch.setattr(warmup.asyncio, 'sleep', no_sleep)
+    state = SimpleNamespace(ready=False)
+
+    await warm_up(state)
+
+    assert state.ready
+    assert len(attempts) == 2
+    assert 'TimeoutError' in caplog.text
+
+# Test for warm_up() not waiting on an unreachable replica
+@pytest.mark.anyio
+async def test_warm_up_replica_unavailable(monkeypatch, caplog):
+    warmed = []
+
+    async def warm_up_engine(database_engine, connections):
+        if database_engine is warmup.replica_engine:
+            raise ConnectionRefusedError()
+        warmed.append(database_engine)
+
+    monkeypatch.setattr(warmup, 'warm_up_engine', warm_up_engine)
+    monkeypatch.setattr(warmup, 'replica_engine', object())
+    state = SimpleNamespace(ready=False)
+
+    await warm_up(state)
+
+    assert state.ready
+    assert warmed == [warmup.engine]
+    assert 'Replica warmup failed' in caplog.text
+
+
+# Endpoint tests
+
+# Test for readiness
+@pytest.mark.anyio
+async def test_ready(async_client):
+    before = await async_client.get('/ready')
+
+    async with lifespan(app):
+        await app.state.warmup
+        during = await async_client.get('/ready')
+
+    after = await async_client.get('/ready')
+
+    assert before.status_code == 503
+    assert during.status_code == 200
+    assert during.json() == {'status': 'ready'}
+    assert after.status_code == 503
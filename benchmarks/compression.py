@@ -0,0 +1,63 @@
+"""Micro-benchmark of the CPU cost of response compression against the bytes it saves.
+
+Renders candidate list pages of typical sizes and an NDJSON export chunk the same way the endpoints do,
+then compresses each with several gzip levels and brotli qualities. Nothing is queried.
+
+    python -m benchmarks.compression --pages 10 100 500
+"""
+import argparse
+import time
+import orjson
+from api.core.compression import _BrotliCompressor, _GzipCompressor
+from api.core.serialization import RowSerializer
+from api.schemas.candidates import CandidateSchema
+from benchmarks.serialization import make_rows
+
+
+GZIP_LEVELS = (1, 5, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def make_payloads(pages: list[int], export_rows: int) -> dict[str, bytes]:
+    serializer = RowSerializer(CandidateSchema)
+    payloads = {f'page {size}': serializer.dump_json(make_rows(size)) for size in pages}
+    rows = serializer.dump_json(make_rows(export_rows))
+    payloads[f'export {export_rows}'] = b''.join(orjson.dumps(row) + b'\n' for row in orjson.loads(rows))
+
+    return payloads
+
+def measure(build, payload: bytes, repeat: int) -> tuple[int, float]:
+    compressed = build().finish(payload)
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        build().finish(payload)
+
+    return len(compressed), (time.perf_counter() - started_at) / repeat
+
+def run(args):
+    payloads = make_payloads(args.pages, args.export_rows)
+    compressors = [(f'gzip {level}', lambda level=level: _GzipCompressor(level)) for level in GZIP_LEVELS]
+    compressors += [(f'br {quality}', lambda quality=quality: _BrotliCompressor(quality)) for quality in BROTLI_QUALITIES]
+
+    print(f"{'payload':<14} {'encoding':<9} {'bytes':>9} {'ratio':>7} {'saved':>9} {'us/page':>10} {'saved/us':>9}")
+    for name, payload in payloads.items():
+        print(f"{name:<14} {'identity':<9} {len(payload):>9}")
+        for encoding, build in compressors:
+            size, seconds = measure(build, payload, args.repeat)
+            saved = len(payload) - size
+            print(
+                f'{name:<14} {encoding:<9} {size:>9} {len(payload) / size:>7.2f} {saved:>9} '
+                f'{seconds * 1e6:>10.1f} {saved / (seconds * 1e6):>9.1f}'
+            )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100, 500], help='List page sizes in rows')
+    parser.add_argument('--export-rows', type=int, default=1000, help='Rows in the export chunk')
+    parser.add_argument('--repeat', type=int, default=50)
+
+    run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    main()
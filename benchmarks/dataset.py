@@ -0,0 +1,76 @@
+import uuid
+from sqlalchemy import func, select, text
+from api.core.db import Base, SessionLocal, engine
+from api.models.applications import Applications
+from api.models.candidates import Candidates
+from api.models.users import Users
+from api.services.applications import rebuild_application_stats
+from api.services.users import get_hashed_password
+
+
+BENCHMARK_USER_EMAIL = 'bench@example.com'
+BENCHMARK_USER_PASSWORD = 'bench'
+SAMPLE_SIZE = 1000
+
+SKILLS = ['python', 'fastapi', 'sqlalchemy', 'javascript', 'react', 'go', 'rust', 'sql', 'docker', 'aws']
+JOB_TITLES = ['software developer', 'data engineer', 'product manager', 'designer', 'qa engineer']
+
+
+def _array_literal(values: list[str]) -> str:
+    return 'ARRAY[' + ', '.join(f"'{value}'" for value in values) + ']'
+
+# Rows are generated server side, so even a million candidates load in one round trip
+INSERT_CANDIDATES = text(f"""
+    INSERT INTO candidates (id, full_name, email, phone, skills, created_at, version)
+    SELECT
+        gen_random_uuid(),
+        'candidate ' || n,
+        'candidate' || n || '@example.com',
+        lpad(n::text, 10, '0'),
+        ARRAY[({_array_literal(SKILLS)})[1 + n % 10], ({_array_literal(SKILLS)})[1 + (n / 10) % 10]],
+        now() - n * interval '1 second',
+        1
+    FROM generate_series(1, :size) AS n
+""")
+
+INSERT_APPLICATIONS = text(f"""
+    INSERT INTO applications (id, candidate_id, job_title, status, applied_at)
+    SELECT gen_random_uuid(), id, ({_array_literal(JOB_TITLES)})[1 + abs(hashtext(email)) % 5], 'APPLIED', created_at
+    FROM candidates
+    WHERE abs(hashtext(email)) % 4 = 0
+""")
+
+
+async def prepare_dataset(size: int, reset: bool = False) -> list[uuid.UUID]:
+    """Make the database hold exactly size generated candidates and return a sample of their ids.
+
+    Existing data is only replaced when reset is set, so the suite never wipes a database by accident.
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with SessionLocal() as db:
+        current_size = await db.scalar(select(func.count()).select_from(Candidates))
+
+        if current_size != size:
+            if current_size and not reset:
+                raise SystemExit(
+                    f'Database holds {current_size} candidates, expected {size}. Pass --reset to regenerate it.'
+                )
+
+            await db.execute(text(f'TRUNCATE {Applications.__tablename__}, {Candidates.__tablename__}'))
+            await db.execute(INSERT_CANDIDATES, {'size': size})
+            await db.execute(INSERT_APPLICATIONS)
+            await rebuild_application_stats(db)
+
+            for table in (Candidates.__tablename__, Applications.__tablename__):
+                await db.execute(text(f'ANALYZE {table}'))
+
+        user = await db.scalar(select(Users).where(Users.email == BENCHMARK_USER_EMAIL))
+        if user is None:
+            db.add(Users(email=BENCHMARK_USER_EMAIL, password=await get_hashed_password(BENCHMARK_USER_PASSWORD)))
+            await db.commit()
+
+        result = await db.scalars(select(Candidates.id).order_by(func.random()).limit(SAMPLE_SIZE))
+
+        return list(result)
@@ -0,0 +1,219 @@
+"""Load and latency benchmarks for the Candidate Management API.
+
+Drives the app from main.py in process through httpx.ASGITransport, or over a real socket with
+--transport http, against generated datasets of the requested sizes. The target database is the one
+configured through DATABASE_URL.
+
+    python -m benchmarks.run --sizes 10000 100000 --save benchmarks/baseline.json
+    python -m benchmarks.run --sizes 10000 --compare benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+import httpx
+import uvicorn
+from api.core.db import engine
+from api.core.metrics import db_queries_per_request
+from api.services.users import create_access_token
+from benchmarks.dataset import BENCHMARK_USER_EMAIL, BENCHMARK_USER_PASSWORD, JOB_TITLES, prepare_dataset
+from main import app
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str
+    build: Callable[[list], dict]
+
+
+SCENARIOS = [
+    Scenario('list', 'GET', '/candidates/', lambda ids: {'url': '/candidates/', 'params': {'limit': 10}}),
+    Scenario(
+        'skills_filter', 'GET', '/candidates/',
+        lambda ids: {'url': '/candidates/', 'params': {'skills': ['python', 'react'], 'match': 'all', 'limit': 10}}
+    ),
+    Scenario(
+        'detail', 'GET', '/candidates/{candidate_id}',
+        lambda ids: {'url': f'/candidates/{random.choice(ids)}'}
+    ),
+    Scenario(
+        'application_create', 'POST', '/candidates/{candidate_id}/applications',
+        lambda ids: {
+            'url': f'/candidates/{random.choice(ids)}/applications',
+            'json': {
+                'job_title': random.choice(JOB_TITLES),
+                'status': 'applied',
+                'applied_at': datetime.now().isoformat()
+            }
+        }
+    ),
+    Scenario(
+        'login', 'POST', '/auth/login',
+        lambda ids: {
+            'url': '/auth/login', 
+            'data': {'username': BENCHMARK_USER_EMAIL, 'password': BENCHMARK_USER_PASSWORD}
+        }
+    ),
+]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+
+    return sorted_values[index]
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, ids: list, requests: int, concurrency: int
+) -> dict:
+    latencies = []
+    errors = 0
+    remaining = requests
+    queries_before = db_queries_per_request.summary(scenario.method, scenario.route)
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started_at = time.perf_counter()
+            response = await client.request(scenario.method, **scenario.build(ids))
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    count_after, queries_after = db_queries_per_request.summary(scenario.method, scenario.route)
+    served = count_after - queries_before[0]
+    latencies.sort()
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'db_queries_per_request': round((queries_after - queries_before[1]) / served, 2) if served else None,
+    }
+
+async def start_server() -> tuple[uvicorn.Server, asyncio.Task, str]:
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=0, log_level='warning', lifespan='off'))
+    task = asyncio.create_task(server.serve())
+
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    return server, task, f'http://127.0.0.1:{port}'
+
+async def run(args) -> dict:
+    token = create_access_token(data={'sub': BENCHMARK_USER_EMAIL})
+    headers = {'Authorization': f'Bearer {token}'}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    scenarios = [scenario for scenario in SCENARIOS if scenario.name in args.scenarios]
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'transport': args.transport,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'results': {},
+    }
+
+    server = task = None
+    if args.transport == 'http':
+        server, task, base_url = await start_server()
+        client = httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench', headers=headers)
+
+    try:
+        for size in args.sizes:
+            ids = await prepare_dataset(size, args.reset)
+            report['results'][str(size)] = {}
+
+            for scenario in scenarios:
+                await run_scenario(client, scenario, ids, args.warmup, args.concurrency)
+                result = await run_scenario(client, scenario, ids, args.requests, args.concurrency)
+                report['results'][str(size)][scenario.name] = result
+                print_result(size, scenario.name, result)
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.should_exit = True
+            await task
+        await engine.dispose()
+
+    return report
+
+def print_result(size: int, name: str, result: dict):
+    print(
+        f"{size:>9} {name:<20} {result['rps']:>9} rps  p50 {result['p50_ms']:>8} ms  "
+        f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+        f"queries {result['db_queries_per_request']}  errors {result['errors']}"
+    )
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a line for every scenario whose p95 latency or throughput regressed beyond threshold."""
+    regressions = []
+
+    for size, scenarios in report['results'].items():
+        for name, result in scenarios.items():
+            previous = baseline.get('results', {}).get(size, {}).get(name)
+            if previous is None:
+                continue
+
+            if result['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+                regressions.append(f"{size} {name}: p95 {previous['p95_ms']} ms -> {result['p95_ms']} ms")
+            if result['rps'] < previous['rps'] * (1 - threshold):
+                regressions.append(f"{size} {name}: {previous['rps']} rps -> {result['rps']} rps")
+
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000], help='Candidate dataset sizes')
+    parser.add_argument('--scenarios', nargs='+', default=[scenario.name for scenario in SCENARIOS],
+                        choices=[scenario.name for scenario in SCENARIOS])
+    parser.add_argument('--requests', type=int, default=500, help='Measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=50, help='Unmeasured requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--transport', choices=['asgi', 'http'], default='asgi')
+    parser.add_argument('--reset', action='store_true', help='Replace existing data when the size differs')
+    parser.add_argument('--save', help='Write the report to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed regression, as a fraction')
+
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(report, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
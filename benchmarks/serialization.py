@@ -0,0 +1,76 @@
+"""Micro-benchmark of the per-row cost of rendering candidate list responses.
+
+Compares FastAPI's default response_model path (validate every ORM row, dump to Python, stdlib json)
+with the RowSerializer fast path used by the list endpoints. Rows are built in memory, nothing is queried.
+
+    python -m benchmarks.serialization --rows 500
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from api.core.serialization import RowSerializer
+from api.models.candidates import Candidates
+from api.schemas.candidates import CandidateSchema
+
+
+def make_rows(count: int) -> list[Candidates]:
+    created_at = datetime(2025, 7, 1, 9, 0)
+
+    return [
+        Candidates(
+            id=uuid.uuid4(),
+            full_name=f'candidate {n}',
+            email=f'candidate{n}@example.com',
+            phone=f'{n:010d}',
+            skills=['python', 'fastapi', 'sqlalchemy'],
+            created_at=created_at + timedelta(seconds=n, microseconds=n),
+            version=1,
+        )
+        for n in range(count)
+    ]
+
+async def render_default(field, rows) -> bytes:
+    # Mirrors fastapi.routing plus JSONResponse.render
+    content = await serialize_response(field=field, response_content=rows)
+
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode()
+
+async def render_fast(serializer, rows) -> bytes:
+    return serializer.dump_json(rows)
+
+async def measure(render, argument, rows, repeat: int) -> float:
+    await render(argument, rows)
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        await render(argument, rows)
+
+    return (time.perf_counter() - started_at) / (repeat * len(rows))
+
+async def run(args):
+    field = create_model_field(name='Response_get_candidates', type_=list[CandidateSchema], mode='serialization')
+    serializer = RowSerializer(CandidateSchema)
+    rows = make_rows(args.rows)
+
+    default = await measure(render_default, field, rows, args.repeat)
+    fast = await measure(render_fast, serializer, rows, args.repeat)
+
+    print(f'{args.rows} rows x {args.repeat} renders')
+    print(f'response_model + json    {default * 1e6:8.2f} us/row')
+    print(f'RowSerializer (orjson)   {fast * 1e6:8.2f} us/row')
+    print(f'speedup                  {default / fast:8.1f}x')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=200)
+
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main()
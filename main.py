@@ -1,8 +1,39 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 
+from api.core.changes import change_listener
+from api.core.compression import CompressionMiddleware
+from api.core.config import compression_settings, job_settings
+from api.core.db import dispose_engines
+from api.core.jobs import job_runner
+from api.core.metrics import MetricsMiddleware
 from api.routers.candidates import router as candidates_router
+from api.routers.changes import router as changes_router
 from api.routers.applications import router as applications_router
+from api.routers.internal import router as internal_router
+from api.routers.jobs import router as jobs_router
+from api.routers.metrics import router as metrics_router
 from api.routers.users import router as users_router
+from api.services.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.warmup = asyncio.create_task(warm_up(app.state))
+    # Picks up jobs left queued or running by a previous process as well as new ones
+    if job_settings.enabled:
+        job_runner.start()
+    yield
+    await job_runner.stop()
+    await change_listener.close()
+    app.state.ready = False
+    app.state.warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.warmup
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -12,13 +43,34 @@ app = FastAPI(
     openapi_tags=[
         {"name": "Candidates", "description": "Operations with candidates"},
         {"name": "Applications", "description": "Manage job applications"},
-    ]
+        {"name": "Jobs", "description": "Background bulk operations"},
+        {"name": "Changes", "description": "Incremental feed of changed candidates and applications"},
+    ],
+    lifespan=lifespan
 )
 
 app.include_router(candidates_router)
 app.include_router(applications_router)
 app.include_router(users_router)
+app.include_router(internal_router)
+app.include_router(jobs_router)
+app.include_router(changes_router)
+app.include_router(metrics_router)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=compression_settings.minimum_size,
+    gzip_level=compression_settings.gzip_level,
+    brotli_quality=compression_settings.brotli_quality
+)
 
 @app.get('/')
 async def index():
     return 'Welcome to Candidate Management API'
+
+@app.get('/ready')
+async def ready():
+    if not getattr(app.state, 'ready', False):
+        return JSONResponse({'status': 'warming up'}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    return {'status': 'ready'}
@@ -0,0 +1,13 @@
+import asyncio
+from api.core.db import SessionLocal
+from api.services.applications import rebuild_application_stats
+
+
+async def rebuild():
+    async with SessionLocal() as db:
+        rows = await rebuild_application_stats(db)
+        print(f'Application stats rebuilt, {rows} rows.')
+
+
+if __name__ == '__main__':
+    asyncio.run(rebuild())
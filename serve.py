@@ -0,0 +1,109 @@
+"""Production entry point: migrate and seed once, then serve main:app from one worker per available CPU.
+
+    python serve.py                 # migrate, seed, serve
+    python serve.py --migrate-only  # release step for deployments that run several containers
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+import uvicorn
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from api.core.config import SYNC_SQLALCHEMY_DATABASE_URL, cache_settings, database_settings, server_settings
+from api.core.db import dispose_engines
+from seed_admin import seed
+
+
+ALEMBIC_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alembic.ini')
+
+# Containers starting together take turns, so migrations and the seed run once
+MIGRATION_LOCK_ID = 7_311_402
+
+
+def cgroup_cpu_limit(path: str = '/sys/fs/cgroup/cpu.max') -> float | None:
+    try:
+        with open(path) as file:
+            quota, period = file.read().split()
+    except (OSError, ValueError):
+        return None
+
+    if quota == 'max':
+        return None
+
+    return int(quota) / int(period)
+
+def available_cpus() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+
+    return max(1, cpus)
+
+async def _seed():
+    try:
+        await seed()
+    finally:
+        # Workers build their own pools, none of these connections may outlive the parent's loop
+        await dispose_engines()
+
+def prepare_database():
+    engine = create_engine(SYNC_SQLALCHEMY_DATABASE_URL)
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:id)'), {'id': MIGRATION_LOCK_ID})
+            try:
+                command.upgrade(Config(ALEMBIC_CONFIG), 'head')
+                asyncio.run(_seed())
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': MIGRATION_LOCK_ID})
+    finally:
+        engine.dispose()
+
+def serve():
+    workers = server_settings.workers or available_cpus()
+    if workers > 1 and cache_settings.backend == 'memory':
+        # Each worker would keep its own version counters, so writes on one never invalidate the others
+        sys.exit(
+            f'CACHE_BACKEND=memory only works with a single worker, not {workers}. '
+            'Use CACHE_BACKEND=redis or set SERVER_WORKERS=1.'
+        )
+
+    connections = workers * (database_settings.pool_size + database_settings.max_overflow)
+    print(f'Starting {workers} workers, up to {connections} database connections.', flush=True)
+
+    # uvicorn's supervisor restarts workers that die or hit max_requests, and all of them on SIGHUP
+    uvicorn.run(
+        'main:app',
+        host=server_settings.host,
+        port=server_settings.port,
+        workers=workers,
+        loop='auto' if sys.platform == 'win32' else 'uvloop',
+        http='httptools',
+        timeout_keep_alive=server_settings.keep_alive,
+        backlog=server_settings.backlog,
+        timeout_graceful_shutdown=server_settings.graceful_timeout,
+        limit_max_requests=server_settings.max_requests,
+        proxy_headers=True,
+        access_log=server_settings.access_log,
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--migrate-only', action='store_true', help='Run migrations and the seed, then exit')
+    args = parser.parse_args(argv)
+
+    if server_settings.run_migrations or args.migrate_only:
+        prepare_database()
+
+    if not args.migrate_only:
+        serve()
+
+
+if __name__ == '__main__':
+    main()